@@ -0,0 +1,217 @@
+import json
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+import pipeline
+import posts
+import routing
+import slackc
+import snowflake
+import sync
+import telemetry
+
+# Width of the windows a backfill is split into; the Slack history of each is scanned in parallel
+WINDOW_HOURS = 24
+
+HOUR_MS = 3600 * 1000
+
+
+@dataclass(frozen=True)
+class Window:
+    """A time range [start_ms, end_ms), open-ended if end_ms is None."""
+
+    start_ms: int
+    end_ms: Optional[int]
+
+    @property
+    def min_id(self) -> int:
+        return snowflake.min_activity_id(self.start_ms)
+
+    @property
+    def max_id(self) -> Optional[int]:
+        """The smallest Snowflake ID after the window, None if it's open-ended."""
+        return None if self.end_ms is None else snowflake.min_activity_id(self.end_ms)
+
+    def contains(self, post_id: int) -> bool:
+        return post_id >= self.min_id and (self.max_id is None or post_id < self.max_id)
+
+
+def split_windows(start_ms: int, end_ms: int, window_hours: float = WINDOW_HOURS) -> List[Window]:
+    """Split [start_ms, end_ms) into windows, oldest first; the last one is open-ended."""
+    step = int(window_hours * HOUR_MS)
+    starts = list(range(start_ms, end_ms, step))
+    return [Window(s, s + step if s != starts[-1] else None) for s in starts]
+
+
+class Checkpoint:
+    """Backfill progress, saved to a JSON file after every step so a rerun can resume.
+
+    Records the Slack history windows already scanned and the posts already
+    made, per channel. A checkpoint only resumes a backfill of the same range
+    and window size; otherwise the backfill starts over.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        max_age_in_hours: float,
+        window_hours: float,
+        now_ms: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.max_age_in_hours = max_age_in_hours
+        self.window_hours = window_hours
+        self.started_at_ms = now_ms if now_ms is not None else snowflake.now_ms()
+        self._channels: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data: Dict[str, Any] = json.load(f)
+            if (data["max_age_in_hours"], data["window_hours"]) == (max_age_in_hours, window_hours):
+                self.started_at_ms = data["started_at_ms"]
+                self._channels = data["channels"]
+
+    def _channel(self, channel_id: str) -> Dict[str, Any]:
+        return self._channels.setdefault(channel_id, {"scanned": {}, "posted": []})
+
+    def scanned(self, channel_id: str, window: Window) -> Optional[Set[str]]:
+        """The URNs found in a window's Slack history, None if it wasn't scanned yet."""
+        with self._lock:
+            urns = self._channel(channel_id)["scanned"].get(str(window.start_ms))
+        return None if urns is None else set(urns)
+
+    def record_scan(self, channel_id: str, window: Window, urns: Set[str]) -> None:
+        with self._lock:
+            self._channel(channel_id)["scanned"][str(window.start_ms)] = sorted(urns)
+        self.save()
+
+    def posted(self, channel_id: str) -> Set[str]:
+        with self._lock:
+            return set(self._channel(channel_id)["posted"])
+
+    def record_post(self, channel_id: str, urns: List[str]) -> None:
+        with self._lock:
+            self._channel(channel_id)["posted"].extend(urns)
+        self.save()
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(
+                {
+                    "started_at_ms": self.started_at_ms,
+                    "max_age_in_hours": self.max_age_in_hours,
+                    "window_hours": self.window_hours,
+                    "channels": self._channels,
+                }
+            )
+            # Write to a temp file first, so a crash never leaves a truncated checkpoint
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the backfill is complete."""
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _scan_channel(channel_id: str, windows: List[Window], checkpoint: Checkpoint) -> Set[str]:
+    """Build a channel's dedup index by scanning its history window by window, in parallel.
+
+    A post is synced after it was created, so the history from the first
+    window up to now holds every post of the range that is already in Slack.
+    The open-ended newest window is rescanned on every run, since messages
+    keep arriving there.
+    """
+    min_id = windows[0].min_id
+
+    def scan(window: Window) -> Set[str]:
+        urns = checkpoint.scanned(channel_id, window)
+        if urns is not None:
+            return urns
+        oldest = window.start_ms / 1000
+        if window is windows[0]:
+            oldest -= slackc.HISTORY_MARGIN_IN_HOURS * 3600
+        latest = None if window.end_ms is None else window.end_ms / 1000
+        with telemetry.span("backfill_scan", channel_id=channel_id, window=window.start_ms):
+            urns = slackc.posted_urns(
+                slackc.slack_messages(channel_id=channel_id, oldest=oldest, latest=latest),
+                min_activity_id=min_id,
+            )
+        if window.end_ms is not None:
+            checkpoint.record_scan(channel_id, window, urns)
+        return urns
+
+    with ThreadPoolExecutor(max_workers=pipeline.MAX_WORKERS) as pool:
+        return set().union(*pool.map(scan, windows))
+
+
+def _post_id(post: posts.Post) -> int:
+    """The Snowflake ID of a post's URN, activity, share or ugcPost."""
+    return int(post.urn.rsplit(":", 1)[1])
+
+
+def backfill(
+    max_age_in_hours: float,
+    checkpoint_path: Optional[str] = None,
+    window_hours: float = WINDOW_HOURS,
+    routes: Optional[List[routing.Route]] = None,
+) -> None:
+    """Sync all LinkedIn posts of the last max_age_in_hours to Slack, resumably.
+
+    The range is split into windows by Snowflake ID bounds. Each channel's
+    history is scanned window by window in parallel, then the missing posts
+    are posted window by window, oldest first across all organizations routed
+    to the channel. LinkedIn lists posts newest first without time filters, so
+    each organization is listed once for the whole range.
+
+    Progress is checkpointed to checkpoint_path after every scanned window and
+    every post. If the backfill fails, a rerun resumes from the checkpoint
+    rather than starting over; once complete, the checkpoint is deleted.
+    """
+    if routes is None:
+        routes = routing.routes_from_env()
+    checkpoint = Checkpoint(checkpoint_path, max_age_in_hours, window_hours)
+    start_ms = checkpoint.started_at_ms - int(max_age_in_hours * HOUR_MS)
+    windows = split_windows(start_ms, checkpoint.started_at_ms, window_hours)
+    if not windows:
+        return
+    org_ids = list(dict.fromkeys(r.org_id for r in routes))
+    channel_ids = list(dict.fromkeys(r.channel_id for r in routes))
+
+    # A resumed backfill still covers the range from when it was first started
+    age_in_hours = math.ceil((snowflake.now_ms() - start_ms) / HOUR_MS)
+    posts_by_org, _ = pipeline.fetch(age_in_hours, org_ids, [])
+
+    for channel_id in channel_ids:
+        with telemetry.span("backfill", channel_id=channel_id, windows=len(windows)) as span:
+            posted = _scan_channel(channel_id, windows, checkpoint) | checkpoint.posted(channel_id)
+            candidates = [
+                post
+                for post in sync.channel_posts(channel_id, routes, posts_by_org)
+                if _post_id(post) >= windows[0].min_id
+            ]
+            new = sync.new_posts(candidates, posted)
+            for window in windows:
+                window_posts = sorted(
+                    (post for post in new if window.contains(_post_id(post))), key=_post_id
+                )
+                for post in window_posts:
+                    slackc.post_slack_message(post.url, channel_id)
+                    checkpoint.record_post(channel_id, [post.urn])
+                telemetry.log(
+                    "Backfill window done",
+                    channel_id=channel_id,
+                    window=window.start_ms,
+                    posts=len(window_posts),
+                )
+            span.set(posts=len(new))
+
+    checkpoint.remove()
@@ -0,0 +1,348 @@
+"""Offline benchmarks for the sync path.
+
+Runs the Slack history scan, the Voyager and official API fetches and a full
+multi-route sync against in-process fake LinkedIn and Slack backends with
+configurable volumes, and reports latency, API calls, bytes transferred and
+peak memory per phase. Compares against benchmarks/baseline.json and exits
+with status 1 on a regression.
+
+    python -m benchmarks.bench_sync
+    python -m benchmarks.bench_sync --messages 20000 --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+import urllib.parse
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+from unittest.mock import patch
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+import httpcache
+import httpclient
+import linkedin
+import pipeline
+import ratelimit
+import slackc
+import snowflake
+import sync
+from routing import Route
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Allowed slowdown against the baseline; wall-clock time is noisy across machines
+LATENCY_TOLERANCE = 3.0
+LATENCY_SLACK_MS = 50.0
+MEMORY_TOLERANCE = 1.5
+
+HOUR_MS = 3600 * 1000
+
+
+@dataclass
+class Scenario:
+    messages: int = 10_000
+    message_interval_seconds: float = 15.0
+    posts: int = 200
+    post_interval_hours: float = 0.5
+    included_per_post: int = 30
+    orgs: int = 5
+    channels: int = 3
+    max_age_in_hours: int = 48
+
+
+@dataclass
+class PhaseResult:
+    latency_ms: float
+    calls: int
+    bytes: int
+    peak_memory_kb: float
+
+
+class Counters:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.bytes = 0
+
+    def add(self, body: bytes) -> None:
+        self.calls += 1
+        self.bytes += len(body)
+
+
+class FakeLinkedIn(BaseAdapter):
+    """Serves Voyager and official API pages for every organization from generated posts."""
+
+    def __init__(self, scenario: Scenario, counters: Counters) -> None:
+        super().__init__()
+        self.scenario = scenario
+        self.counters = counters
+        now = snowflake.now_ms()
+        interval_ms = int(scenario.post_interval_hours * HOUR_MS)
+        # Newest first, like both APIs
+        self.created_at = [now - (i + 1) * interval_ms for i in range(scenario.posts)]
+
+    def _voyager_page(self, org_id: int, start: int, count: int) -> Dict[str, Any]:
+        included: List[Dict[str, Any]] = []
+        for created_at in self.created_at[start : start + count]:
+            # The low bits keep each organization's posts distinct
+            activity_id = snowflake.min_activity_id(created_at) + org_id
+            included.append(
+                {
+                    "entityUrn": f"urn:li:fsd_update:(urn:li:activity:{activity_id},"
+                    "COMPANY_FEED_ADMIN,EMPTY,DEFAULT,false)",
+                    "$type": "com.linkedin.voyager.dash.feed.Update",
+                }
+            )
+            # Profiles, images, social details etc. decorating each update
+            included.extend(
+                {
+                    "entityUrn": f"urn:li:fsd_socialDetail:(urn:li:activity:{activity_id},{n})",
+                    "commentary": {"text": "Lorem ipsum dolor sit amet " * 8},
+                }
+                for n in range(self.scenario.included_per_post - 1)
+            )
+        return {"data": {}, "included": included}
+
+    def _official_page(self, org_id: int, start: int, count: int) -> Dict[str, Any]:
+        elements = [
+            {
+                "id": f"urn:li:share:{snowflake.min_activity_id(created_at) + 1000 + org_id}",
+                "createdAt": created_at,
+                "distribution": {"feedDistribution": "MAIN_FEED"},
+                "commentary": "Lorem ipsum dolor sit amet " * 8,
+            }
+            for created_at in self.created_at[start : start + count]
+        ]
+        return {"elements": elements}
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        url = urllib.parse.urlparse(request.url or "")
+        query = urllib.parse.parse_qs(url.query)
+        if url.path == "/voyager/api/graphql":
+            variables = query["variables"][0]
+            org_id = int(variables.split("organizationalPageUUId:")[1].split(")")[0])
+            start = int(variables.split("start:")[1].split(",")[0])
+            count = int(variables.split("count:")[1].split(",")[0])
+            data = self._voyager_page(org_id, start, count)
+        else:
+            org_id = int(query["author"][0].rsplit(":", 1)[1])
+            data = self._official_page(org_id, int(query["start"][0]), int(query["count"][0]))
+
+        body = json.dumps(data).encode()
+        self.counters.add(body)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        response.raw = io.BytesIO(body)
+        response.url = request.url or ""
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class FakeSlack:
+    """Stands in for slack_sdk.WebClient with one generated history per channel."""
+
+    token = "fake-token"
+
+    def __init__(self, scenario: Scenario, counters: Counters, now_ms: int) -> None:
+        self.counters = counters
+        self.post_counters = Counters()
+        # Newest first; older LinkedIn posts were already synced, interleaved with chatter
+        self.history: List[Dict[str, Any]] = []
+        now = now_ms / 1000
+        for i in range(scenario.messages):
+            ts = now - (i + 1) * scenario.message_interval_seconds
+            text = "Just a regular message about something else entirely"
+            message: Dict[str, Any] = {"type": "message", "ts": f"{ts:.6f}", "text": text}
+            if i % 10 == 0:
+                activity_id = snowflake.min_activity_id(int(ts * 1000) - 2 * HOUR_MS)
+                message["text"] = (
+                    f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"
+                )
+                # Half of them posted before messages were tagged with metadata
+                if i % 20 == 0:
+                    message["metadata"] = slackc.message_metadata(message["text"])
+            self.history.append(message)
+
+    def conversations_history(self, **kwargs: Any) -> Dict[str, Any]:
+        oldest = float(kwargs.get("oldest", 0))
+        start = int(kwargs.get("cursor") or 0)
+        limit = int(kwargs.get("limit", 100))
+        page = [m for m in self.history[start : start + limit] if float(m["ts"]) >= oldest]
+        if not kwargs.get("include_all_metadata"):
+            page = [{k: v for k, v in m.items() if k != "metadata"} for m in page]
+        more = len(page) == limit and start + limit < len(self.history)
+        response = {
+            "ok": True,
+            "messages": page,
+            "has_more": more,
+            "response_metadata": {"next_cursor": str(start + limit) if more else ""},
+        }
+        self.counters.add(json.dumps(response).encode())
+        return response
+
+    def chat_postMessage(self, **kwargs: Any) -> Dict[str, Any]:
+        response = {"ok": True, "channel": kwargs["channel"], "ts": f"{time.time():.6f}"}
+        self.post_counters.add(json.dumps(kwargs).encode())
+        return response
+
+
+def _measure(func: Callable[[], Any], counters: List[Counters]) -> PhaseResult:
+    calls_before = sum(c.calls for c in counters)
+    bytes_before = sum(c.bytes for c in counters)
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+    latency_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return PhaseResult(
+        latency_ms=round(latency_ms, 1),
+        calls=sum(c.calls for c in counters) - calls_before,
+        bytes=sum(c.bytes for c in counters) - bytes_before,
+        peak_memory_kb=round(peak / 1024, 1),
+    )
+
+
+@contextlib.contextmanager
+def fake_backends(scenario: Scenario) -> Iterator[Dict[str, Counters]]:
+    linkedin_counters = Counters()
+    slack_counters = Counters()
+    fake_slack = FakeSlack(scenario, slack_counters, snowflake.now_ms())
+    session = requests.Session()
+    session.mount("https://", FakeLinkedIn(scenario, linkedin_counters))
+    # Posting is paced for the real Slack API; don't sleep against the fake one
+    unlimited = ratelimit.TokenBucket(rate=1e9, capacity=1e9)
+    env = {
+        "LINKEDIN_LI_AT": "fake-li-at",
+        "LINKEDIN_CSRF_TOKEN": "fake-csrf",
+        "LINKEDIN_TOKEN": "fake-token",
+        "LINKEDIN_ORG_ID": "1",
+        "SLACK_CHANNEL_ID": "C1",
+        # Measure cold fetches: no phase may reuse another phase's responses
+        "SOMESY_HTTP_CACHE_TTL_SECONDS": "0",
+    }
+    with (
+        patch.dict(os.environ, env),
+        patch.object(httpclient, "_session", session),
+        patch.object(httpcache, "_cache", None),
+        patch.object(slackc, "slack_client", return_value=fake_slack),
+        patch.object(slackc, "_post_bucket", return_value=unlimited),
+    ):
+        for name in ("SOMESY_STATE_FILE", "SOMESY_ROUTES", "SOMESY_HTTP_CACHE_FILE"):
+            os.environ.pop(name, None)
+        yield {
+            "linkedin": linkedin_counters,
+            "slack": slack_counters,
+            "slack_posts": fake_slack.post_counters,
+        }
+
+
+def run(scenario: Scenario) -> Dict[str, PhaseResult]:
+    routes = [
+        Route(str(org), f"C{(org + c) % scenario.channels}")
+        for org in range(scenario.orgs)
+        for c in range(min(2, scenario.channels))
+    ]
+    max_age = scenario.max_age_in_hours
+    results: Dict[str, PhaseResult] = {}
+    with fake_backends(scenario) as counters:
+        results["slack_history"] = _measure(
+            lambda: pipeline.posted_urns_in_channel(max_age, "C1"), [counters["slack"]]
+        )
+        results["voyager"] = _measure(
+            lambda: linkedin.recent_voyager_posts(max_age), [counters["linkedin"]]
+        )
+        results["official_api"] = _measure(
+            lambda: linkedin.recent_official_api_posts(max_age), [counters["linkedin"]]
+        )
+        results["sync"] = _measure(
+            lambda: sync.linkedin_to_slack(max_age, routes=routes), list(counters.values())
+        )
+    return results
+
+
+def regressions(
+    results: Mapping[str, PhaseResult], baseline: Mapping[str, Mapping[str, float]]
+) -> List[str]:
+    problems: List[str] = []
+    for phase, result in results.items():
+        if phase not in baseline:
+            continue
+        base = baseline[phase]
+        if result.calls > base["calls"]:
+            problems.append(f"{phase}: {result.calls} calls, baseline {base['calls']}")
+        if result.bytes > base["bytes"]:
+            problems.append(f"{phase}: {result.bytes} bytes, baseline {base['bytes']}")
+        if result.latency_ms > base["latency_ms"] * LATENCY_TOLERANCE + LATENCY_SLACK_MS:
+            problems.append(f"{phase}: {result.latency_ms}ms, baseline {base['latency_ms']}ms")
+        if result.peak_memory_kb > base["peak_memory_kb"] * MEMORY_TOLERANCE:
+            problems.append(
+                f"{phase}: {result.peak_memory_kb}KB peak, baseline {base['peak_memory_kb']}KB"
+            )
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = Scenario()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--messages", type=int, default=defaults.messages)
+    parser.add_argument("--posts", type=int, default=defaults.posts)
+    parser.add_argument("--included-per-post", type=int, default=defaults.included_per_post)
+    parser.add_argument("--orgs", type=int, default=defaults.orgs)
+    parser.add_argument("--channels", type=int, default=defaults.channels)
+    parser.add_argument("--max-age-in-hours", type=int, default=defaults.max_age_in_hours)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    scenario = Scenario(
+        messages=args.messages,
+        posts=args.posts,
+        included_per_post=args.included_per_post,
+        orgs=args.orgs,
+        channels=args.channels,
+        max_age_in_hours=args.max_age_in_hours,
+    )
+    results = run(scenario)
+
+    print(f"{'phase':<15}{'latency ms':>12}{'calls':>8}{'bytes':>12}{'peak KB':>10}")
+    for phase, r in results.items():
+        print(f"{phase:<15}{r.latency_ms:>12}{r.calls:>8}{r.bytes:>12}{r.peak_memory_kb:>10}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({phase: asdict(r) for phase, r in results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if scenario != defaults:
+        print("Custom scenario, not comparing against the baseline")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --update-baseline")
+        return 0
+    with open(args.baseline) as f:
+        problems = regressions(results, json.load(f))
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
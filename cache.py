@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+class LRUCache:
+    """Thread-safe LRU cache with per-entry expiry, optionally persisted to a JSON file.
+
+    Values must be JSON-serializable when a path is given. Expired entries are
+    dropped on access and when the cache is loaded or saved.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._clock = clock
+        # key -> (expires_at or None, value), least recently used first
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for key, (expires_at, value) in json.load(f).items():
+                    self._entries[key] = (expires_at, value)
+            self._evict()
+
+    def _expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= self._clock()
+
+    def _evict(self) -> None:
+        for key in [k for k, (expires_at, _) in self._entries.items() if self._expired(expires_at)]:
+            del self._entries[key]
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0]):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            expires_at = None if self.ttl_seconds is None else self._clock() + self.ttl_seconds
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self) -> None:
+        """Write the cache to its file, if it has one."""
+        if not self.path:
+            return
+        with self._lock:
+            self._evict()
+            entries = dict(self._entries)
+        # Write to a temp file first, so a crash never leaves a truncated cache file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
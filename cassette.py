@@ -0,0 +1,151 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# SOMESY_HTTP_CASSETTE_MODE values
+PASSTHROUGH = "passthrough"
+RECORD = "record"
+REPLAY = "replay"
+
+# Response headers not recorded: bodies are stored decoded, and cookies are never stored
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+# method, URL, digest of the request body
+Key = Tuple[str, str, str]
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def mode() -> str:
+    return os.getenv("SOMESY_HTTP_CASSETTE_MODE", PASSTHROUGH)
+
+
+def _key(request: requests.PreparedRequest) -> Key:
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    return (request.method or "GET", request.url or "", hashlib.sha256(body).hexdigest()[:16])
+
+
+class Cassette:
+    """Request/response pairs in a JSON lines file, one exchange per line.
+
+    Only what's needed to replay a response is stored: no request headers, so
+    credentials never end up in a cassette. Repeated requests are replayed in
+    the order they were recorded, the last response repeating.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._exchanges: Dict[Key, List[Dict[str, Any]]] = {}
+        self._replayed: Dict[Key, int] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    exchange = json.loads(line)
+                    key = (exchange["method"], exchange["url"], exchange["body_sha"])
+                    self._exchanges.setdefault(key, []).append(exchange)
+
+    def record(self, request: requests.PreparedRequest, response: requests.Response) -> None:
+        method, url, body_sha = _key(request)
+        try:
+            body, encoding = response.content.decode(), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(response.content).decode(), "base64"
+        exchange = {
+            "method": method,
+            "url": url,
+            "body_sha": body_sha,
+            "status": response.status_code,
+            "headers": {
+                k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS
+            },
+            "body": body,
+            "encoding": encoding,
+        }
+        line = json.dumps(exchange, separators=(",", ":"))
+        with self._lock:
+            self._exchanges.setdefault((method, url, body_sha), []).append(exchange)
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+    def replay(self, request: requests.PreparedRequest) -> requests.Response:
+        key = _key(request)
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise CassetteMiss(f"No recorded response for {key[0]} {key[1]} in {self.path}")
+            n = self._replayed.get(key, 0)
+            self._replayed[key] = n + 1
+            exchange = exchanges[min(n, len(exchanges) - 1)]
+
+        body = exchange["body"]
+        content = base64.b64decode(body) if exchange["encoding"] == "base64" else body.encode()
+        response = requests.Response()
+        response.status_code = exchange["status"]
+        response.headers = CaseInsensitiveDict(exchange["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(content)
+        response.url = request.url or ""
+        response.request = request
+        return response
+
+
+class CassetteAdapter(BaseAdapter):
+    """Transport adapter recording the exchanges of another adapter, or replaying them.
+
+    In replay mode no request reaches the network; each response is delayed
+    by latency_seconds to mimic a real round trip.
+    """
+
+    def __init__(
+        self, inner: BaseAdapter, cassette: Cassette, mode: str, latency_seconds: float = 0
+    ) -> None:
+        super().__init__()
+        self.inner = inner
+        self.cassette = cassette
+        self.mode = mode
+        self.latency_seconds = latency_seconds
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        if self.mode == REPLAY:
+            if self.latency_seconds:
+                time.sleep(self.latency_seconds)
+            return self.cassette.replay(request)
+        response = self.inner.send(request, **kwargs)
+        if self.mode == RECORD:
+            # Reads the body; a streaming caller then iterates over the content read
+            self.cassette.record(request, response)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def adapter_from_env(inner: BaseAdapter) -> BaseAdapter:
+    """Wrap inner according to SOMESY_HTTP_CASSETTE_MODE; passthrough returns it as is."""
+    cassette_mode = mode()
+    if cassette_mode == PASSTHROUGH:
+        return inner
+    if cassette_mode not in (RECORD, REPLAY):
+        raise ValueError(f"Invalid SOMESY_HTTP_CASSETTE_MODE: {cassette_mode!r}")
+    path: Optional[str] = os.getenv("SOMESY_HTTP_CASSETTE_FILE")
+    if not path:
+        raise ValueError("SOMESY_HTTP_CASSETTE_FILE is required in record and replay mode")
+    latency_ms = float(os.getenv("SOMESY_HTTP_REPLAY_LATENCY_MS", "0"))
+    return CassetteAdapter(inner, Cassette(path), cassette_mode, latency_ms / 1000)
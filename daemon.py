@@ -0,0 +1,129 @@
+import os
+import signal
+import threading
+from typing import Iterable, List, Optional, Set
+
+import leases
+import routing
+import snowflake
+import state
+import sync
+import telemetry
+
+# Poll interval bounds: around the hours posts usually appear, and in hours without any
+MIN_POLL_SECONDS = 5 * 60
+MAX_POLL_SECONDS = 60 * 60
+
+HOUR_MS = 3600 * 1000
+
+
+class PollSchedule:
+    """Poll interval adapted to the observed posting cadence.
+
+    Post creation times are counted per hour of the day, UTC, including the neighbouring hours, since scheduled posts cluster
+    around the full hour. The interval is min_interval in the busiest hour and
+    backs off linearly towards max_interval in hours without posts, but never
+    sleeps into a busier hour. Until posts are observed, it polls at
+    min_interval.
+    """
+
+    def __init__(
+        self, min_interval: float = MIN_POLL_SECONDS, max_interval: float = MAX_POLL_SECONDS
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._seen: Set[int] = set()
+        self._posts_per_hour = [0] * 24
+
+    def observe(self, created_at_ms: Iterable[int]) -> None:
+        """Count posts by creation time; posts observed in earlier cycles are skipped."""
+        for ms in created_at_ms:
+            if ms and ms not in self._seen:
+                self._seen.add(ms)
+                self._posts_per_hour[ms // HOUR_MS % 24] += 1
+
+    def _activity(self, hour: int) -> int:
+        return sum(self._posts_per_hour[(hour + d) % 24] for d in (-1, 0, 1))
+
+    def interval(self, now_ms: Optional[int] = None) -> float:
+        """Seconds to wait before the next poll."""
+        if not self._seen:
+            return self.min_interval
+        if now_ms is None:
+            now_ms = snowflake.now_ms()
+        hour = now_ms // HOUR_MS % 24
+        busiest = max(self._activity(h) for h in range(24))
+        share = self._activity(hour) / busiest
+        interval = self.max_interval - (self.max_interval - self.min_interval) * share
+        if self._activity(hour + 1) > self._activity(hour):
+            until_next_hour = (HOUR_MS - now_ms % HOUR_MS) / 1000
+            interval = min(interval, max(until_next_hour, self.min_interval))
+        return interval
+
+
+def poll_schedule_from_env() -> PollSchedule:
+    """A poll schedule bounded by SOMESY_POLL_MIN_SECONDS and SOMESY_POLL_MAX_SECONDS."""
+    return PollSchedule(
+        min_interval=float(os.getenv("SOMESY_POLL_MIN_SECONDS", MIN_POLL_SECONDS)),
+        max_interval=float(os.getenv("SOMESY_POLL_MAX_SECONDS", MAX_POLL_SECONDS)),
+    )
+
+
+def run(
+    max_age_in_hours: int = 2 * 24,
+    routes: Optional[List[routing.Route]] = None,
+    store: Optional[state.StateStore] = None,
+    schedule: Optional[PollSchedule] = None,
+    stop: Optional[threading.Event] = None,
+    cycles: Optional[int] = None,
+) -> None:
+    """Sync LinkedIn posts to Slack in a loop until stop is set (or after cycles syncs).
+
+    Unlike a function invocation per Pub/Sub message, the process stays warm:
+    the HTTP session, response and URN caches, the Voyager circuit breaker and
+    the dedup index persist between cycles. Without SOMESY_STATE_FILE, the
+    dedup index is an in-memory state store, so the Slack history is only
+    scanned for posts not synced yet or when a reconciliation is due.
+
+    A failed cycle is logged and retried at the next poll.
+    """
+    if routes is None:
+        routes = routing.routes_from_env()
+    if store is None:
+        store = state.state_store_from_env(in_memory=True)
+    if schedule is None:
+        schedule = poll_schedule_from_env()
+    if stop is None:
+        stop = threading.Event()
+    lease_store = leases.lease_store_from_env()
+
+    cycle = 0
+    while True:
+        cycle += 1
+        try:
+            posts_by_org = sync.linkedin_to_slack(
+                max_age_in_hours, store, routes, lease_store=lease_store
+            )
+            schedule.observe(
+                post.created_at for org_posts in posts_by_org.values() for post in org_posts
+            )
+        except Exception as e:
+            telemetry.log(f"Sync cycle {cycle} failed: {e}", severity="ERROR")
+        if cycles is not None and cycle >= cycles:
+            return
+        interval = schedule.interval()
+        telemetry.log("Waiting for next poll", cycle=cycle, interval_seconds=round(interval))
+        if stop.wait(interval):
+            return
+
+
+def main() -> None:
+    """Run the daemon until SIGTERM (as sent by Cloud Run) or SIGINT."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    run(stop=stop)
+
+
+if __name__ == "__main__":
+    main()
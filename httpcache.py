@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import requests
+
+import cache
+import httpclient
+import telemetry
+
+T = TypeVar("T")
+
+# Listings without ETag or Last-Modified are reused for this long without a request
+DEFAULT_TTL_SECONDS = 60.0
+
+# How long entries with validators are kept for revalidation
+MAX_AGE_SECONDS = 24 * 3600
+
+CACHE_MAX_SIZE = 1000
+
+_cache: Optional[cache.LRUCache] = None
+_cache_lock = threading.Lock()
+
+
+def ttl_seconds() -> float:
+    return float(os.getenv("SOMESY_HTTP_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+
+def response_cache() -> cache.LRUCache:
+    """Return the response cache, persisted to SOMESY_HTTP_CACHE_FILE if set."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = cache.LRUCache(
+                    max_size=CACHE_MAX_SIZE,
+                    ttl_seconds=MAX_AGE_SECONDS,
+                    path=os.getenv("SOMESY_HTTP_CACHE_FILE") or None,
+                )
+    return _cache
+
+
+def get(
+    url: str,
+    parse: Callable[[requests.Response], T],
+    headers: Optional[Dict[str, str]] = None,
+    **kwargs: Any,
+) -> T:
+    """GET a URL and parse the response, caching the parsed result.
+
+    If the server sent an ETag or Last-Modified header, the cached result is
+    revalidated with a conditional request, and reused without parsing on a
+    304. Otherwise it is reused without any request for ttl_seconds().
+
+    parse() is only called for responses that weren't answered from the cache;
+    it should raise for error responses, which are never cached. Results must
+    be JSON-serializable when the cache is persisted.
+    """
+    entry: Optional[Dict[str, Any]] = response_cache().get(url)
+    now = time.time()
+    validators = {}
+    if entry is not None:
+        if entry["etag"]:
+            validators["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            validators["If-Modified-Since"] = entry["last_modified"]
+        if not validators and now - entry["fetched_at"] < ttl_seconds():
+            telemetry.count("http_cache.hits")
+            return entry["result"]  # type: ignore[no-any-return]
+
+    with httpclient.session().get(url, headers={**(headers or {}), **validators}, **kwargs) as r:
+        if r.status_code == 304 and entry is not None:
+            telemetry.count("http_cache.revalidated")
+            entry = {**entry, "fetched_at": now}
+            result: T = entry["result"]
+        else:
+            telemetry.count("http_cache.misses")
+            result = parse(r)
+            entry = {
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "fetched_at": now,
+                "result": result,
+            }
+    response_cache().put(url, entry)
+    return result
+
+
+def save() -> None:
+    """Persist the cache, if it has a file; called once per run rather than per request."""
+    if _cache is not None:
+        _cache.save()
@@ -0,0 +1,74 @@
+import http.cookiejar
+import threading
+import urllib.parse
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import cassette
+import telemetry
+
+# Hosts kept in the pool (www.linkedin.com, api.linkedin.com, slack.com)
+POOL_CONNECTIONS = 4
+
+# Connections kept per host, enough for the concurrent fetches in pipeline.py
+POOL_MAXSIZE = 10
+
+# Seconds to establish a connection, and to wait for each read from the socket
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 20.0
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class _TimeoutAdapter(HTTPAdapter):
+    """Applies the default timeouts to requests that don't set their own."""
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        return super().send(request, **kwargs)
+
+
+def _log_response(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+    """Response hook timing each HTTP call (up to the response headers)."""
+    if not telemetry.enabled():
+        return
+    # Only host and path: query strings can be long and carry identifiers
+    url = urllib.parse.urlsplit(response.url)
+    telemetry.log_http(
+        response.request.method or "GET",
+        f"{url.scheme}://{url.netloc}{url.path}",
+        response.status_code,
+        response.elapsed.total_seconds(),
+    )
+
+
+def session() -> requests.Session:
+    """Return the process-wide HTTP session, creating it on first use.
+
+    The session keeps TLS connections alive across calls and, in a warm Cloud
+    Run instance, across invocations. Cookies set by servers are not stored,
+    so credentials passed per request never leak between APIs. Requests
+    without a timeout get CONNECT_TIMEOUT and READ_TIMEOUT, so a hanging
+    server can't stall a run. SOMESY_HTTP_CASSETTE_MODE records or replays
+    all exchanges (see cassette.py).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                s.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                adapter = cassette.adapter_from_env(
+                    _TimeoutAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.hooks["response"].append(_log_response)
+                _session = s
+    return _session
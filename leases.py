@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+# How long a claim blocks other invocations; an unfinished claim expires after
+# this, so a crashed invocation doesn't block a post forever
+LEASE_SECONDS = 10 * 60
+
+# How long completed posts are remembered
+RETENTION_SECONDS = 7 * 24 * 3600
+
+
+class LeaseStore:
+    """Per-key leases, so overlapping invocations post each message only once.
+
+    claim() a key before posting and complete() it afterwards, or release()
+    it if posting failed so another invocation can retry. A key can't be
+    claimed while another owner's lease is active, nor once it's complete.
+    This base class keeps the leases in memory, which only covers threads of
+    one process; subclasses share them between processes.
+    """
+
+    def __init__(
+        self,
+        lease_seconds: float = LEASE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+        self._clock = clock
+        # key -> (owner, expires_at, completed_at or None)
+        self._leases: Dict[str, Tuple[str, float, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: str) -> bool:
+        """Take the lease on key; False if it's held by another owner or complete."""
+        now = self._clock()
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None:
+                owner, expires_at, completed_at = lease
+                if completed_at is not None or (owner != self.owner and expires_at > now):
+                    return False
+            self._leases[key] = (self.owner, now + self.lease_seconds, None)
+            return True
+
+    def complete(self, key: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._leases[key] = (self.owner, now, now)
+
+    def release(self, key: str) -> None:
+        """Give up an unfinished lease held by this owner."""
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease[0] == self.owner and lease[2] is None:
+                del self._leases[key]
+
+
+class SqliteLeaseStore(LeaseStore):
+    """Lease store in a SQLite database, shared by processes on the same filesystem.
+
+    Claims run in an immediate transaction, so two processes can't both take
+    the same lease. Completed leases older than RETENTION_SECONDS are pruned
+    when the store is opened.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = LEASE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(lease_seconds, clock)
+        self.path = path
+        # Autocommit mode, transactions are explicit; one connection shared under the lock
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "key TEXT PRIMARY KEY, owner TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, completed_at REAL)"
+            )
+            self._conn.execute(
+                "DELETE FROM leases WHERE completed_at < ?",
+                (self._clock() - RETENTION_SECONDS,),
+            )
+
+    def claim(self, key: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT owner, expires_at, completed_at FROM leases WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    owner, expires_at, completed_at = row
+                    if completed_at is not None or (owner != self.owner and expires_at > now):
+                        return False
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO leases VALUES (?, ?, ?, NULL)",
+                    (key, self.owner, now + self.lease_seconds),
+                )
+                return True
+            finally:
+                self._conn.execute("COMMIT")
+
+    def complete(self, key: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO leases VALUES (?, ?, ?, ?)", (key, self.owner, now, now)
+            )
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM leases WHERE key = ? AND owner = ? AND completed_at IS NULL",
+                (key, self.owner),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def lease_store_from_env() -> Optional[LeaseStore]:
+    """Return the lease store configured via SOMESY_LEASE_FILE, or None if not set."""
+    path = os.getenv("SOMESY_LEASE_FILE")
+    if not path:
+        return None
+    return SqliteLeaseStore(path)
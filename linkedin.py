@@ -1,20 +1,34 @@
 import os
 import re
 import urllib.parse
-from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
 
 import requests
 
+import httpcache
+import posts
+import snowflake
+import telemetry
 
-def age_in_hours(post: Dict[str, Any]) -> float:
-    created: datetime = datetime.fromtimestamp(post["createdAt"] / 1000.0)
-    age: float = (datetime.now() - created).total_seconds() / 3600
-    return age
+# Posts requested per page from each API
+VOYAGER_PAGE_SIZE = 10
+OFFICIAL_API_PAGE_SIZE = 10
 
+# Upper bound on pages fetched per call, in case a page never leaves the window
+MAX_PAGES = 50
 
-def is_in_main_feed(post: Dict[str, Any]) -> bool:
-    return str(post["distribution"]["feedDistribution"]) == "MAIN_FEED"
+# Activity IDs of feed updates, e.g. urn:li:fsd_update:(urn:li:activity:7413922466504495104,...)
+FSD_UPDATE_PATTERN = re.compile(rb"fsd_update:\(urn:li:activity:(\d+)")
+
+# Bytes read per chunk when streaming a Voyager response
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Bytes carried over between chunks, longer than any FSD_UPDATE_PATTERN match
+STREAM_OVERLAP = 64
+
+
+def linkedin_org_id() -> str:
+    return os.getenv("LINKEDIN_ORG_ID", "")
 
 
 def timestamp_from_activity_id(activity_id: str) -> int:
@@ -22,33 +36,90 @@ def timestamp_from_activity_id(activity_id: str) -> int:
 
     LinkedIn uses Snowflake IDs where the first 41 bits contain the timestamp.
     """
-    as_binary = bin(int(activity_id))[2:]  # Remove '0b' prefix, no zero-padding
-    timestamp_bits = as_binary[:41]
-    return int(timestamp_bits, 2)
+    return snowflake.timestamp_ms(activity_id)
 
 
 def age_in_hours_from_activity_id(activity_id: str) -> float:
     """Calculate age in hours from LinkedIn activity ID."""
-    created_ms = timestamp_from_activity_id(activity_id)
-    now_ms = datetime.now().timestamp() * 1000
-    return (now_ms - created_ms) / (1000 * 3600)
+    return snowflake.age_in_hours(activity_id)
 
 
-def recent_voyager_posts(max_age_in_hours: int = 24) -> List[str]:
+def stream_activity_ids(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Extract activity IDs of fsd_update URNs from a Voyager response body.
+
+    Scans the raw bytes chunk by chunk instead of parsing the JSON, carrying a
+    short tail over so URNs split across chunks are still found. Each ID is
+    yielded once, in order of first appearance.
+    """
+    seen: Set[str] = set()
+
+    def new_ids(buffer: bytes, final: bool) -> Iterator[str]:
+        for match in FSD_UPDATE_PATTERN.finditer(buffer):
+            # Digits running up to the end of the buffer may continue in the next chunk
+            if not final and match.end() == len(buffer):
+                break
+            activity_id = match.group(1).decode()
+            if activity_id not in seen:
+                seen.add(activity_id)
+                yield activity_id
+
+    tail = b""
+    for chunk in chunks:
+        buffer = tail + chunk
+        yield from new_ids(buffer, final=False)
+        tail = buffer[-STREAM_OVERLAP:]
+    yield from new_ids(tail, final=True)
+
+
+def _voyager_page(
+    headers: Dict[str, str], cookies: Dict[str, str], org_id: str, start: int
+) -> List[str]:
+    """Fetch one page of the admin feed, returning its activity IDs."""
+    variables = (
+        f"(organizationalPageFeedUseCase:ADMIN_ORGANIZATIONAL_PAGE_POSTS,"
+        f"organizationalPageIdOrUniversalName:(organizationalPageUUId:{org_id}),"
+        f"start:{start},count:{VOYAGER_PAGE_SIZE},numComments:0)"
+    )
+    query_id = "voyagerFeedDashOrganizationalPageAdminUpdates.674de8f5f692ab9c9ce0ab819ecae05e"
+
+    # Streamed, so the payload (hundreds of KB of nested entities) is never held in memory
+    return httpcache.get(
+        f"https://www.linkedin.com/voyager/api/graphql?includeWebMetadata=true&variables={variables}&queryId={query_id}",
+        _parse_voyager_page,
+        headers=headers,
+        cookies=cookies,
+        stream=True,
+    )
+
+
+def _parse_voyager_page(response: requests.Response) -> List[str]:
+    if response.status_code != 200:
+        raise Exception(
+            f"Voyager API request failed with status {response.status_code}: {response.text}. "
+            f"See README.md for troubleshooting (expired cookies, outdated queryId, etc.)"
+        )
+    return list(stream_activity_ids(response.iter_content(STREAM_CHUNK_SIZE)))
+
+
+def recent_voyager_posts(
+    max_age_in_hours: int = 24, org_id: Optional[str] = None
+) -> List[posts.Post]:
     """Fetch recent posts using LinkedIn's internal Voyager API.
 
     This fetches posts from the admin page, including those created via
     LinkedIn's native scheduler (which the official Posts API doesn't return).
+    The feed is newest first, so pages are fetched until a page's oldest post
+    is outside the window (or MAX_PAGES is reached).
 
-    Returns a list of activity IDs (just the numeric part).
+    Returns the posts, oldest first.
     Raises an exception if the API call fails.
     """
     li_at = os.getenv("LINKEDIN_LI_AT")
     csrf_token = os.getenv("LINKEDIN_CSRF_TOKEN")
-    org_id = os.getenv("LINKEDIN_ORG_ID")
+    org_id = org_id or linkedin_org_id()
 
     if not all([li_at, csrf_token, org_id]):
-        print("LinkedIn Voyager API: credentials not configured, skipping")
+        telemetry.log("LinkedIn Voyager API: credentials not configured, skipping")
         return []
 
     # Type narrowing for mypy after the None check above
@@ -64,62 +135,49 @@ def recent_voyager_posts(max_age_in_hours: int = 24) -> List[str]:
         "JSESSIONID": f'"{csrf_token}"',
     }
 
-    variables = (
-        f"(organizationalPageFeedUseCase:ADMIN_ORGANIZATIONAL_PAGE_POSTS,"
-        f"organizationalPageIdOrUniversalName:(organizationalPageUUId:{org_id}),"
-        f"start:0,count:10,numComments:0)"
-    )
-    query_id = "voyagerFeedDashOrganizationalPageAdminUpdates.674de8f5f692ab9c9ce0ab819ecae05e"
-
-    response = requests.get(
-        f"https://www.linkedin.com/voyager/api/graphql?includeWebMetadata=true&variables={variables}&queryId={query_id}",
-        headers=headers,
-        cookies=cookies,
-    )
-
-    if response.status_code != 200:
-        raise Exception(
-            f"Voyager API request failed with status {response.status_code}: {response.text}. "
-            f"See README.md for troubleshooting (expired cookies, outdated queryId, etc.)"
+    now = snowflake.now_ms()
+    min_id = snowflake.min_activity_id_for_age(max_age_in_hours, now)
+    activity_ids: Set[str] = set()
+    with telemetry.span("voyager", org_id=org_id) as span:
+        for page in range(MAX_PAGES):
+            page_ids = _voyager_page(headers, cookies, org_id, start=page * VOYAGER_PAGE_SIZE)
+            telemetry.count("voyager.pages")
+            # Filter by max age using the Snowflake ID bound, one comparison per ID
+            in_window = [aid for aid in page_ids if int(aid) >= min_id]
+            activity_ids.update(in_window)
+            if len(page_ids) < VOYAGER_PAGE_SIZE or len(in_window) < len(page_ids):
+                break
+        span.set(pages=page + 1, posts=len(activity_ids))
+
+    # Sort by ID ascending (oldest first, so newest appears last in Slack)
+    recent_posts = [posts.Post.from_activity_id(aid) for aid in sorted(activity_ids, key=int)]
+    if telemetry.enabled():
+        telemetry.log(
+            f"LinkedIn Voyager API: {len(recent_posts)} posts within {max_age_in_hours}h",
+            org_id=org_id,
+            posts=[
+                {"urn": post.urn, "age_in_hours": round(post.age_in_hours(now), 1)}
+                for post in recent_posts
+            ],
         )
-
-    data = response.json()
-
-    # Extract activity IDs from fsd_update items
-    included = data.get("included", [])
-    activity_ids: List[str] = []
-
-    for item in included:
-        entity_urn = item.get("entityUrn", "")
-        if "fsd_update:(urn:li:activity:" in entity_urn:
-            match = re.search(r"urn:li:activity:(\d+)", entity_urn)
-            if match:
-                activity_ids.append(match.group(1))
-
-    # Filter by max age using timestamp from Snowflake ID
-    filtered_ids = [
-        aid for aid in activity_ids if age_in_hours_from_activity_id(aid) <= max_age_in_hours
-    ]
-
-    # Sort by ID ascending (oldest first, so newest appears last in Slack), limit to 10
-    sorted_ids = sorted(filtered_ids, key=int)[:10]
-    print(f"LinkedIn Voyager API: {len(sorted_ids)} posts within {max_age_in_hours}h:")
-    for aid in sorted_ids:
-        age = age_in_hours_from_activity_id(aid)
-        print(f"  urn:li:activity:{aid} ({age:.1f}h ago)")
-    return sorted_ids
+    return recent_posts
 
 
-def recent_official_api_posts(max_age_in_hours: int = 24) -> List[Dict[str, Any]]:
+def recent_official_api_posts(
+    max_age_in_hours: int = 24, org_id: Optional[str] = None
+) -> List[posts.Post]:
     """Fetch recent posts using LinkedIn's official Posts API.
 
     Note: This API does not return posts created via LinkedIn's native scheduler.
     Use recent_voyager_posts() for those.
 
-    Returns a list of post objects with 'id' field containing the URN.
+    Posts are listed newest first, so pages are fetched until a page's oldest
+    post is outside the window (or MAX_PAGES is reached).
+
+    Returns the posts in the main feed, oldest first.
     """
     linkedin_token = os.getenv("LINKEDIN_TOKEN")
-    org_id = os.getenv("LINKEDIN_ORG_ID")
+    org_id = org_id or linkedin_org_id()
     headers: Dict[str, str] = {
         "Authorization": f"Bearer {linkedin_token}",
         "X-Restli-Protocol-Version": "2.0.0",
@@ -127,23 +185,55 @@ def recent_official_api_posts(max_age_in_hours: int = 24) -> List[Dict[str, Any]
     }
     # https://learn.microsoft.com/en-us/linkedin/shared/api-guide/concepts/urns
     author_urn_url_enc: str = urllib.parse.quote_plus(f"urn:li:organization:{org_id}")
-    # https://learn.microsoft.com/en-us/linkedin/marketing/community-management/shares/posts-api?view=li-lms-2024-10&tabs=http#find-posts-by-authors
-    response = requests.get(
-        f"https://api.linkedin.com/rest/posts?author={author_urn_url_enc}&q=author&count=10&sortBy=CREATED",
-        headers=headers,
+
+    fetched: List[posts.Post] = []
+    with telemetry.span("official_api", org_id=org_id) as span:
+        for page in range(MAX_PAGES):
+            # https://learn.microsoft.com/en-us/linkedin/marketing/community-management/shares/posts-api?view=li-lms-2024-10&tabs=http#find-posts-by-authors
+            rows = httpcache.get(
+                f"https://api.linkedin.com/rest/posts?author={author_urn_url_enc}&q=author"
+                f"&start={page * OFFICIAL_API_PAGE_SIZE}&count={OFFICIAL_API_PAGE_SIZE}&sortBy=CREATED",
+                _parse_official_api_page,
+                headers=headers,
+            )
+            page_posts = [posts.Post.from_row(row) for row in rows]
+            telemetry.count("official_api.pages")
+            fetched.extend(page_posts)
+            if len(page_posts) < OFFICIAL_API_PAGE_SIZE:
+                break
+            if max(p.age_in_hours() for p in page_posts) > max_age_in_hours:
+                break
+        span.set(pages=page + 1)
+
+    now = snowflake.now_ms()
+    recent_posts = sorted(
+        (
+            post
+            for post in fetched
+            if post.in_main_feed and post.age_in_hours(now) <= max_age_in_hours
+        ),
+        key=lambda p: p.created_at,
     )
+    if telemetry.enabled():
+        telemetry.log(
+            f"LinkedIn Official API: {len(recent_posts)} posts within {max_age_in_hours}h",
+            org_id=org_id,
+            posts=[
+                {"urn": post.urn, "age_in_hours": round(post.age_in_hours(now), 1)}
+                for post in recent_posts
+            ],
+        )
+    return recent_posts
+
+
+def _parse_official_api_page(response: requests.Response) -> List[List[Any]]:
+    """Parse a page into Post rows, so only the fields used are cached, as JSON."""
     if response.status_code != 200:
         raise Exception(
             f"LinkedIn Official API request failed with status {response.status_code}: {response.text}"
         )
-    posts: List[Dict[str, Any]] = response.json()["elements"]
-    recent_posts: List[Dict[str, Any]] = [
-        post for post in posts if is_in_main_feed(post) and age_in_hours(post) <= max_age_in_hours
-    ]
-    print(f"LinkedIn Official API: {len(recent_posts)} posts within {max_age_in_hours}h:")
-    for post in recent_posts:
-        print(f"  {post['id']} ({age_in_hours(post):.1f}h ago)")
-    return recent_posts
+    elements: List[Dict[str, Any]] = response.json()["elements"]
+    return [posts.Post.from_official_api(element).to_row() for element in elements]
 
 
 def recent_post_urls(max_age_in_hours: int = 24) -> List[str]:
@@ -151,16 +241,14 @@ def recent_post_urls(max_age_in_hours: int = 24) -> List[str]:
 
     Tries the Voyager API first (includes natively scheduled posts),
     falls back to the official Posts API if Voyager returns no posts.
+    See pipeline.fetch() for a variant querying both sources concurrently.
 
     Returns a list of LinkedIn post URLs, oldest first.
     """
-    activity_ids = recent_voyager_posts(max_age_in_hours)
+    voyager_posts = recent_voyager_posts(max_age_in_hours)
 
-    if activity_ids:
-        return [
-            f"https://www.linkedin.com/feed/update/urn:li:activity:{aid}" for aid in activity_ids
-        ]
+    if voyager_posts:
+        return posts.urls(voyager_posts)
 
     # Fall back to official Posts API
-    posts = recent_official_api_posts(max_age_in_hours)
-    return [f"https://www.linkedin.com/feed/update/{post['id']}" for post in posts]
+    return posts.urls(recent_official_api_posts(max_age_in_hours))
@@ -1,6 +1,10 @@
+import os
+
 import dotenv
 
-import sync
+import backfill
 
 _ = dotenv.load_dotenv(verbose=True, override=True)
-sync.linkedin_to_slack(28 * 24)
+backfill.backfill(
+    28 * 24, checkpoint_path=os.getenv("SOMESY_BACKFILL_CHECKPOINT", ".backfill-checkpoint.json")
+)
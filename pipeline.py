@@ -0,0 +1,162 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import linkedin
+import posts
+import resilience
+import slackc
+import snowflake
+import telemetry
+
+# Per-source timeouts in seconds
+VOYAGER_TIMEOUT = 30.0
+OFFICIAL_API_TIMEOUT = 30.0
+SLACK_TIMEOUT = 60.0
+
+# Share of the remaining deadline the fetch phase may use; posting gets the rest
+FETCH_SHARE = 0.5
+
+# Sources fetched at the same time, across all organizations and channels
+MAX_WORKERS = int(os.getenv("SOMESY_MAX_WORKERS", "4"))
+
+# The sources are blocking HTTP clients, so each one runs on a worker thread.
+# A dedicated executor (rather than asyncio's default one) means a source that
+# times out doesn't hold up asyncio.run() while its thread finishes.
+_executor = ThreadPoolExecutor(max_workers=4 * MAX_WORKERS, thread_name_prefix="somesy-fetch")
+
+
+async def _run_source(
+    limit: asyncio.Semaphore, func: Callable[..., Any], timeout: float, *args: Any
+) -> Any:
+    # The timeout only starts once a worker slot is free
+    async with limit:
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(loop.run_in_executor(_executor, func, *args), timeout)
+
+
+async def _circuit_open() -> Any:
+    raise resilience.CircuitOpen("LinkedIn Voyager API circuit open, skipped")
+
+
+def posted_urns_in_channel(max_age_in_hours: int, channel_id: str) -> Set[str]:
+    """Scan the Slack channel history into a dedup index for the sync window."""
+    with telemetry.span("slack_history", channel_id=channel_id) as span:
+        posted = slackc.posted_urns(
+            slackc.slack_messages(max_age_in_hours, channel_id),
+            min_activity_id=snowflake.min_activity_id_for_age(max_age_in_hours),
+        )
+        span.set(urns=len(posted))
+    return posted
+
+
+def _merge_linkedin_sources(voyager_result: Any, official_result: Any) -> List[posts.Post]:
+    """Prefer Voyager posts, use the official API if Voyager returns nothing or fails."""
+    if not isinstance(voyager_result, BaseException) and voyager_result:
+        return list(voyager_result)
+    if isinstance(official_result, BaseException):
+        # Voyager is the primary source, so its error is the more useful one, unless it was skipped
+        if isinstance(voyager_result, BaseException) and not isinstance(
+            voyager_result, resilience.CircuitOpen
+        ):
+            raise voyager_result
+        raise official_result
+    if isinstance(voyager_result, BaseException):
+        telemetry.count("voyager.fallbacks")
+        telemetry.log(
+            f"LinkedIn Voyager API failed, using official API posts: {voyager_result!r}",
+            severity="WARNING",
+        )
+    return list(official_result)
+
+
+async def fetch_async(
+    max_age_in_hours: int,
+    org_ids: List[str],
+    channel_ids: List[str],
+    max_workers: int = MAX_WORKERS,
+    voyager_timeout: float = VOYAGER_TIMEOUT,
+    official_api_timeout: float = OFFICIAL_API_TIMEOUT,
+    slack_timeout: float = SLACK_TIMEOUT,
+) -> Tuple[Dict[str, List[posts.Post]], Dict[str, Set[str]]]:
+    """Fetch LinkedIn posts and Slack dedup indexes concurrently.
+
+    Queries the Voyager API and the official Posts API for each organization
+    and scans the history of each channel at the same time, at most
+    max_workers at once and each with its own timeout. Every organization and
+    channel is fetched once, however many routes share it. The LinkedIn
+    sources are merged like linkedin.recent_post_urls().
+
+    Returns the LinkedIn posts (oldest first) per organization and the URNs
+    already posted per channel.
+    """
+    limit = asyncio.Semaphore(max_workers)
+    breaker = resilience.voyager_breaker()
+    voyager_allowed = breaker.allow()
+    if not voyager_allowed:
+        telemetry.count("voyager.circuit_open")
+    sources = []
+    for org_id in org_ids:
+        if voyager_allowed:
+            sources.append(
+                _run_source(
+                    limit, linkedin.recent_voyager_posts, voyager_timeout, max_age_in_hours, org_id
+                )
+            )
+        else:
+            sources.append(_circuit_open())
+        sources.append(
+            _run_source(
+                limit,
+                linkedin.recent_official_api_posts,
+                official_api_timeout,
+                max_age_in_hours,
+                org_id,
+            )
+        )
+    for channel_id in channel_ids:
+        sources.append(
+            _run_source(limit, posted_urns_in_channel, slack_timeout, max_age_in_hours, channel_id)
+        )
+    results = await asyncio.gather(*sources, return_exceptions=True)
+
+    if voyager_allowed:
+        for voyager_result in results[: 2 * len(org_ids) : 2]:
+            if isinstance(voyager_result, BaseException):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+    posts_by_org: Dict[str, List[posts.Post]] = {}
+    for i, org_id in enumerate(org_ids):
+        posts_by_org[org_id] = _merge_linkedin_sources(results[2 * i], results[2 * i + 1])
+
+    posted: Dict[str, Set[str]] = {}
+    for channel_id, result in zip(channel_ids, results[2 * len(org_ids) :]):
+        if isinstance(result, BaseException):
+            raise result
+        posted[channel_id] = result
+    return posts_by_org, posted
+
+
+def fetch(
+    max_age_in_hours: int,
+    org_ids: List[str],
+    channel_ids: List[str],
+    deadline: Optional[resilience.Deadline] = None,
+) -> Tuple[Dict[str, List[posts.Post]], Dict[str, Set[str]]]:
+    """Blocking wrapper around fetch_async(), within FETCH_SHARE of the deadline."""
+    deadline = deadline or resilience.Deadline()
+    deadline.check("fetching")
+    with telemetry.span("fetch", orgs=len(org_ids), channels=len(channel_ids)):
+        return asyncio.run(
+            fetch_async(
+                max_age_in_hours,
+                org_ids,
+                channel_ids,
+                voyager_timeout=deadline.budget(FETCH_SHARE, VOYAGER_TIMEOUT),
+                official_api_timeout=deadline.budget(FETCH_SHARE, OFFICIAL_API_TIMEOUT),
+                slack_timeout=deadline.budget(FETCH_SHARE, SLACK_TIMEOUT),
+            )
+        )
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import snowflake
+import state
+
+# Post sources
+VOYAGER = "voyager"
+OFFICIAL_API = "official_api"
+SLACK = "slack"
+
+POST_URL_PREFIX = "https://www.linkedin.com/feed/update/"
+
+
+@dataclass(frozen=True, slots=True)
+class Post:
+    """A LinkedIn post, reduced to the fields somesy uses.
+
+    Built once when a response is parsed, so the full API object isn't kept
+    in memory and consumers don't traverse it again. activity_id is only set
+    for activity URNs; feed_distribution only for official API posts.
+    """
+
+    urn: str
+    activity_id: Optional[int]
+    created_at: int
+    source: str
+    feed_distribution: Optional[str] = None
+
+    @classmethod
+    def from_urn(cls, urn: str, source: str, created_at: Optional[int] = None) -> "Post":
+        """A post identified by its URN, created at the time in its Snowflake ID by default.
+
+        Activity, share and ugcPost IDs are all Snowflakes.
+        """
+        if created_at is None:
+            created_at = snowflake.timestamp_ms(urn.rsplit(":", 1)[1])
+        return cls(urn, state.activity_id_from_urn(urn), created_at, source)
+
+    @classmethod
+    def from_activity_id(cls, activity_id: Union[str, int]) -> "Post":
+        """A post from a Voyager feed update."""
+        return cls.from_urn(f"urn:li:activity:{activity_id}", VOYAGER)
+
+    @classmethod
+    def from_official_api(cls, element: Dict[str, Any]) -> "Post":
+        """A post from a Posts API element."""
+        urn = element["id"]
+        return cls(
+            urn,
+            state.activity_id_from_urn(urn),
+            int(element["createdAt"]),
+            OFFICIAL_API,
+            str(element["distribution"]["feedDistribution"]),
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Post":
+        return cls(*row)
+
+    def to_row(self) -> List[Any]:
+        """The fields as a JSON-serializable list, e.g. for the response cache."""
+        return [self.urn, self.activity_id, self.created_at, self.source, self.feed_distribution]
+
+    @property
+    def url(self) -> str:
+        return f"{POST_URL_PREFIX}{self.urn}"
+
+    @property
+    def in_main_feed(self) -> bool:
+        """False for official API posts with a feed distribution other than MAIN_FEED."""
+        return self.feed_distribution in (None, "MAIN_FEED")
+
+    def age_in_hours(self, now: Optional[int] = None) -> float:
+        if now is None:
+            now = snowflake.now_ms()
+        return (now - self.created_at) / (1000 * 3600)
+
+
+def urls(posts: Sequence[Post]) -> List[str]:
+    return [post.url for post in posts]
@@ -0,0 +1,121 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+# Consecutive failures that open the Voyager circuit, and how long it stays open
+FAILURE_THRESHOLD = 3
+COOLDOWN_SECONDS = 30 * 60
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class Deadline:
+    """A time budget for one invocation, shared out across its phases."""
+
+    def __init__(
+        self, seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._clock = clock
+        self._expires_at = math.inf if seconds is None else clock() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative; infinite without a deadline."""
+        return max(0.0, self._expires_at - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def budget(self, share: float, cap: float) -> float:
+        """Time for a phase: a share of what's left, but no more than cap."""
+        return min(cap, self.remaining() * share)
+
+    def check(self, phase: str) -> None:
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline exceeded before {phase}")
+
+
+def deadline_from_env() -> Deadline:
+    """A deadline of SOMESY_DEADLINE_SECONDS from now, or none if unset."""
+    seconds = os.getenv("SOMESY_DEADLINE_SECONDS")
+    return Deadline(float(seconds) if seconds else None)
+
+
+class CircuitBreaker:
+    """Stops calling a failing source for a cooldown, optionally persisted to a JSON file.
+
+    After failure_threshold consecutive failures the circuit opens and allow()
+    returns False until cooldown_seconds have passed. The next call is then let
+    through as a trial: a success closes the circuit, a failure reopens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown_seconds: float = COOLDOWN_SECONDS,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.path = path
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self._failures = data["failures"]
+            self._opened_at = data["opened_at"]
+
+    def allow(self) -> bool:
+        """Whether the source should be called now."""
+        with self._lock:
+            return (
+                self._opened_at is None or self._clock() >= self._opened_at + self.cooldown_seconds
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+    def save(self) -> None:
+        """Write the state to the breaker's file, if it has one."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {"failures": self._failures, "opened_at": self._opened_at}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+_voyager_breaker: Optional[CircuitBreaker] = None
+_voyager_breaker_lock = threading.Lock()
+
+
+def voyager_breaker() -> CircuitBreaker:
+    """Return the Voyager circuit breaker, persisted to SOMESY_BREAKER_FILE if set."""
+    global _voyager_breaker
+    if _voyager_breaker is None:
+        with _voyager_breaker_lock:
+            if _voyager_breaker is None:
+                _voyager_breaker = CircuitBreaker(path=os.getenv("SOMESY_BREAKER_FILE") or None)
+    return _voyager_breaker
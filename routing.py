@@ -0,0 +1,41 @@
+import os
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass(frozen=True)
+class Route:
+    """Posts of a LinkedIn organization are synced to a Slack channel."""
+
+    org_id: str
+    channel_id: str
+
+
+def parse_routes(spec: str) -> List[Route]:
+    """Parse a routes spec like "12345=C111,C222;67890=C111".
+
+    Each ";"-separated entry maps one LinkedIn organization ID to one or more
+    Slack channel IDs. An organization can feed several channels and several
+    organizations can feed the same channel.
+    """
+    routes: List[Route] = []
+    for entry in spec.split(";"):
+        if not entry.strip():
+            continue
+        org_id, sep, channel_ids = entry.partition("=")
+        channels = [c.strip() for c in channel_ids.split(",") if c.strip()]
+        if not sep or not org_id.strip() or not channels:
+            raise ValueError(f"Invalid route {entry!r}, expected ORG_ID=CHANNEL_ID[,CHANNEL_ID...]")
+        for channel_id in channels:
+            route = Route(org_id.strip(), channel_id)
+            if route not in routes:
+                routes.append(route)
+    return routes
+
+
+def routes_from_env() -> List[Route]:
+    """Routes from SOMESY_ROUTES, or the single LINKEDIN_ORG_ID -> SLACK_CHANNEL_ID route."""
+    spec = os.getenv("SOMESY_ROUTES")
+    if spec:
+        return parse_routes(spec)
+    return [Route(os.getenv("LINKEDIN_ORG_ID", ""), os.getenv("SLACK_CHANNEL_ID", ""))]
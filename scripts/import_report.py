@@ -0,0 +1,77 @@
+"""Report what importing the Cloud Function entry point costs on a cold start.
+
+Imports the module in a fresh interpreter with -X importtime and prints the
+slowest imports by cumulative time. With --budget-ms, exits with status 1 if
+the whole import takes longer.
+
+    python scripts/import_report.py
+    SOMESY_SLACK_TRANSPORT=minimal python scripts/import_report.py --budget-ms 400
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    """Parse `import time: self [us] | cumulative | imported package` lines."""
+    imports: List[ImportTime] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        imports.append(ImportTime(module.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def measure(module: str) -> List[ImportTime]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float)
+    args = parser.parse_args(argv)
+
+    imports = measure(args.module)
+    total_ms = next(i.cumulative_us for i in imports if i.module == args.module) / 1000
+
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for i in sorted(imports, key=lambda i: i.cumulative_us, reverse=True)[: args.top]:
+        print(
+            f"{i.cumulative_us / 1000:>14.1f}{i.self_us / 1000:>10.1f}  {'  ' * i.depth}{i.module}"
+        )
+    print(f"Importing {args.module} took {total_ms:.1f}ms")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"Over the budget of {args.budget_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,367 @@
 import os
 import re
-from typing import Any, Dict, List
+import sys
+import time
+import urllib.parse
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
-from slack_sdk import WebClient
-from slack_sdk.web import SlackResponse
+import cassette
+import posts
+import ratelimit
+import resilience
+import snowflake
+import slackweb
+import telemetry
+
+if TYPE_CHECKING:
+    import slack_sdk
+
+    import leases
+
+    SlackClient = Union[slack_sdk.WebClient, slackweb.WebClient]
+
+# Messages per conversations.history page (Slack recommends no more than 200)
+HISTORY_PAGE_SIZE = 200
+
+# Extra history scanned beyond the sync window, so posts made shortly before a
+# LinkedIn post's creation time (clock skew, manual reposts) are still found
+HISTORY_MARGIN_IN_HOURS = 1
+
+# LinkedIn post URNs as they appear in post URLs
+URN_PATTERN = re.compile(r"urn:li:(?:activity|share|ugcPost):\d+")
+
+# Event type of the message metadata attached to synced posts
+# https://api.slack.com/metadata/using
+METADATA_EVENT_TYPE = "linkedin_post_synced"
+
+
+# chat.postMessage allows about one message per second per channel, with short bursts
+# https://api.slack.com/methods/chat.postMessage#rate_limiting
+POST_RATE_PER_SECOND = 1.0
+POST_BURST = 3
+
+# Retries of a message after a ratelimited response, honouring Retry-After
+MAX_RATE_LIMIT_RETRIES = 3
+
+# PostOutcome statuses
+POSTED = "posted"
+FAILED = "failed"
+SKIPPED = "skipped"
+# Posted, or being posted, by another invocation holding the lease
+CLAIMED = "claimed"
+
+# SOMESY_SLACK_TRANSPORT values: slack_sdk, or the minimal client in slackweb.py
+SDK_TRANSPORT = "sdk"
+MINIMAL_TRANSPORT = "minimal"
+
+_client: Optional["SlackClient"] = None
+_post_buckets: Dict[str, ratelimit.TokenBucket] = {}
+
+
+@dataclass
+class PostOutcome:
+    message: str
+    status: str
+    error: Optional[str] = None
 
 
 def slack_channel_id() -> str:
     return os.getenv("SLACK_CHANNEL_ID", "")
 
 
-def slack_client() -> WebClient:
+def slack_transport() -> str:
+    return os.getenv("SOMESY_SLACK_TRANSPORT", SDK_TRANSPORT)
+
+
+def slack_client() -> "SlackClient":
+    """Return the process-wide Slack client, reused across calls and warm invocations.
+
+    slack_sdk is only imported here, on first use: with pipeline.fetch() that
+    happens on a worker thread, overlapping the import with the LinkedIn calls.
+    SOMESY_SLACK_TRANSPORT=minimal skips it altogether. The minimal client is
+    also used when recording or replaying a cassette, since only requests made
+    via httpclient go through it.
+    """
+    global _client
     slack_token = os.getenv("SLACK_TOKEN", "")
-    return WebClient(token=slack_token)
+    minimal = slack_transport() == MINIMAL_TRANSPORT or cassette.mode() != cassette.PASSTHROUGH
+    if (
+        _client is None
+        or _client.token != slack_token
+        or isinstance(_client, slackweb.WebClient) != minimal
+    ):
+        if minimal:
+            _client = slackweb.WebClient(token=slack_token)
+        else:
+            from slack_sdk import WebClient
+
+            _client = WebClient(token=slack_token)
+    return _client
+
 
+def _api_errors() -> Tuple[Type[Exception], ...]:
+    """Error types raised by the Slack clients; slack_sdk's can't be raised before it's loaded."""
+    sdk_errors = sys.modules.get("slack_sdk.errors")
+    if sdk_errors is None:
+        return (slackweb.SlackApiError,)
+    return (slackweb.SlackApiError, sdk_errors.SlackApiError)
 
-def slack_messages() -> List[Dict[str, Any]]:
-    # find existing messages in channel
+
+def _call(method: str, func: Callable[..., Any], **kwargs: Any) -> Any:
+    """Call a Web API method, logging it like the HTTP calls made via httpclient."""
+    if not telemetry.enabled() or isinstance(getattr(func, "__self__", None), slackweb.WebClient):
+        # The minimal client's calls go through httpclient and are logged there
+        return func(**kwargs)
+    start = time.perf_counter()
+    status = 200
+    try:
+        return func(**kwargs)
+    except _api_errors() as e:
+        status = e.response.status_code  # type: ignore[attr-defined]
+        raise
+    finally:
+        telemetry.log_http(
+            "POST", f"https://slack.com/api/{method}", status, time.perf_counter() - start
+        )
+
+
+def slack_messages(
+    max_age_in_hours: Optional[float] = None,
+    channel_id: Optional[str] = None,
+    oldest: Optional[float] = None,
+    latest: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream messages from the Slack channel, newest first.
+
+    Follows conversations.history cursors page by page. With max_age_in_hours,
+    only messages within that window (plus HISTORY_MARGIN_IN_HOURS) are
+    requested and the scan stops as soon as it is past the window. Instead,
+    oldest and latest (Unix timestamps) select an exact time range.
+    """
     # https://api.slack.com/methods/conversations.history
-    channel_id = slack_channel_id()
-    response: SlackResponse = slack_client().conversations_history(channel=channel_id)
-    messages: List[Dict[str, Any]] = response["messages"]
+    channel_id = channel_id or slack_channel_id()
+    client = slack_client()
+    if oldest is None and max_age_in_hours is not None:
+        oldest = time.time() - (max_age_in_hours + HISTORY_MARGIN_IN_HOURS) * 3600
+
     # Extract URNs from message URLs for logging
-    urns = []
+    log_urns = telemetry.enabled()
+    urns: List[str] = []
+    cursor: Optional[str] = None
+    while True:
+        kwargs: Dict[str, Any] = {
+            "channel": channel_id,
+            "limit": HISTORY_PAGE_SIZE,
+            "include_all_metadata": True,
+        }
+        if oldest is not None:
+            kwargs["oldest"] = f"{oldest:.6f}"
+        if latest is not None:
+            kwargs["latest"] = f"{latest:.6f}"
+        if cursor:
+            kwargs["cursor"] = cursor
+        response = _call("conversations.history", client.conversations_history, **kwargs)
+        telemetry.count("slack_history.pages")
+
+        messages: List[Dict[str, Any]] = response["messages"]
+        for m in messages:
+            if oldest is not None and float(m.get("ts", "inf")) < oldest:
+                cursor = None
+                break
+            if log_urns:
+                urns.extend(message_urns(m))
+            yield m
+        else:
+            cursor = (response.get("response_metadata") or {}).get("next_cursor")
+        if not cursor:
+            break
+
+    if log_urns:
+        # Sort by ID ascending (oldest first)
+        sorted_urns = sorted(urns, key=lambda u: int(u.split(":")[-1]))
+        telemetry.log(
+            f"Slack channel: {len(sorted_urns)} LinkedIn posts",
+            channel_id=channel_id,
+            urns=sorted_urns,
+        )
+
+
+def urns_in_text(text: str) -> List[str]:
+    """Extract LinkedIn post URNs from a message text or URL.
+
+    Percent-encoded URLs (urn%3Ali%3Aactivity%3A...) are decoded first, so the
+    result doesn't depend on how the link was formatted.
+    """
+    if "%3" in text:
+        text = urllib.parse.unquote(text)
+    return URN_PATTERN.findall(text)
+
+
+def message_metadata(message: str) -> Optional[Dict[str, Any]]:
+    """Metadata tagging a message with the LinkedIn post it links to, if any."""
+    urns = urns_in_text(message)
+    if not urns:
+        return None
+    return {
+        "event_type": METADATA_EVENT_TYPE,
+        "event_payload": {
+            "urn": urns[0],
+            "created_at": snowflake.timestamp_ms(urns[0].rsplit(":", 1)[1]),
+        },
+    }
+
+
+def message_posts(message: Dict[str, Any]) -> List[posts.Post]:
+    """LinkedIn posts a Slack message links to.
+
+    Messages posted by somesy carry the URN and creation time in their
+    metadata, which are used as is, even if the text was edited since. Older
+    messages fall back to scanning the text.
+    """
+    metadata = message.get("metadata")
+    if metadata and metadata.get("event_type") == METADATA_EVENT_TYPE:
+        payload = metadata.get("event_payload") or {}
+        if payload.get("urn"):
+            return [posts.Post.from_urn(payload["urn"], posts.SLACK, payload.get("created_at"))]
+    return [posts.Post.from_urn(urn, posts.SLACK) for urn in urns_in_text(message.get("text", ""))]
+
+
+def message_urns(message: Dict[str, Any]) -> List[str]:
+    """LinkedIn post URNs a Slack message links to, see message_posts()."""
+    return [post.urn for post in message_posts(message)]
+
+
+def posted_urns(messages: Iterable[Dict[str, Any]], min_activity_id: int = 0) -> Set[str]:
+    """Build the dedup index: the set of LinkedIn post URNs found in messages.
+
+    Activity URNs below min_activity_id (see snowflake.min_activity_id_for_age)
+    can never match a candidate post and are left out.
+    """
+    urns: Set[str] = set()
     for m in messages:
-        text = m.get("text", "")
-        match = re.search(r"(urn:li:(?:activity|share|ugcPost):\d+)", text)
-        if match:
-            urns.append(match.group(1))
-    # Sort by ID ascending (oldest first)
-    sorted_urns = sorted(urns, key=lambda u: int(u.split(":")[-1]))
-    print(f"Slack channel: {len(sorted_urns)} LinkedIn posts:")
-    for urn in sorted_urns:
-        print(f"  {urn}")
-    return messages
-
-
-def post_slack_message(message: str) -> None:
-    print(f"Posting to Slack: {message}")
-    slack_client().chat_postMessage(channel=slack_channel_id(), text=message)
+        for post in message_posts(m):
+            if min_activity_id and post.activity_id is not None:
+                if post.activity_id < min_activity_id:
+                    continue
+            urns.add(post.urn)
+    return urns
+
+
+def _post_bucket(channel_id: str) -> ratelimit.TokenBucket:
+    if channel_id not in _post_buckets:
+        _post_buckets[channel_id] = ratelimit.TokenBucket(POST_RATE_PER_SECOND, POST_BURST)
+    return _post_buckets[channel_id]
+
+
+def _retry_after(e: Any) -> Optional[float]:
+    """Seconds to wait if the Web API error is a rate limit, None otherwise."""
+    if e.response.status_code != 429 and e.response.get("error") != "ratelimited":
+        return None
+    headers = e.response.headers
+    return float(headers.get("Retry-After", headers.get("retry-after", 1)))
+
+
+def post_slack_message(message: str, channel_id: Optional[str] = None) -> None:
+    """Post a message, paced by the channel's rate limit and retried when ratelimited."""
+    channel_id = channel_id or slack_channel_id()
+    bucket = _post_bucket(channel_id)
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        telemetry.count("slack.post_wait_ms", int(bucket.acquire() * 1000))
+        telemetry.log("Posting to Slack", channel_id=channel_id, text=message)
+        try:
+            _call(
+                "chat.postMessage",
+                slack_client().chat_postMessage,
+                channel=channel_id,
+                text=message,
+                metadata=message_metadata(message),
+            )
+            return
+        except _api_errors() as e:
+            retry_after = _retry_after(e)
+            if retry_after is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            telemetry.count("slack.rate_limited")
+            telemetry.log(
+                f"Slack rate limit hit, retrying in {retry_after:.0f}s",
+                severity="WARNING",
+                channel_id=channel_id,
+            )
+            bucket.pause(retry_after)
+
+
+def _post_once(message: str, channel_id: str, lease_store: Optional["leases.LeaseStore"]) -> bool:
+    """Post a message unless another invocation holds its lease; False if one does."""
+    urns = urns_in_text(message)
+    if lease_store is None or not urns:
+        post_slack_message(message, channel_id)
+        return True
+    key = f"{channel_id}:{urns[0]}"
+    if not lease_store.claim(key):
+        return False
+    try:
+        post_slack_message(message, channel_id)
+    except Exception:
+        lease_store.release(key)
+        raise
+    lease_store.complete(key)
+    return True
+
+
+def post_slack_messages(
+    messages: List[str],
+    channel_id: Optional[str] = None,
+    deadline: Optional[resilience.Deadline] = None,
+    lease_store: Optional["leases.LeaseStore"] = None,
+) -> List[PostOutcome]:
+    """Post messages to the channel in the given order.
+
+    Messages are posted one at a time, since Slack orders a channel by arrival.
+    After a failure, or once the deadline has passed, the remaining messages
+    are skipped rather than posted out of order. The outcomes tell which
+    messages still need posting.
+
+    With a lease store, each message's channel and post URN are claimed
+    before posting, and messages claimed by an overlapping invocation are
+    left to it, so each post is sent once.
+    """
+    channel_id = channel_id or slack_channel_id()
+    outcomes: List[PostOutcome] = []
+    failed = False
+    with telemetry.span("post", channel_id=channel_id) as span:
+        for message in messages:
+            if failed:
+                outcomes.append(PostOutcome(message, SKIPPED))
+                continue
+            try:
+                if deadline is not None:
+                    deadline.check("posting")
+                if not _post_once(message, channel_id, lease_store):
+                    outcomes.append(PostOutcome(message, CLAIMED))
+                    telemetry.count("slack.claimed_elsewhere")
+                    continue
+                outcomes.append(PostOutcome(message, POSTED))
+                telemetry.count("slack.posts")
+            except Exception as e:
+                telemetry.log(
+                    f"Posting to Slack failed: {e!r}", severity="ERROR", channel_id=channel_id
+                )
+                outcomes.append(PostOutcome(message, FAILED, str(e)))
+                telemetry.count("slack.post_failures")
+                failed = True
+        span.set(posts=sum(o.status == POSTED for o in outcomes))
+    return outcomes
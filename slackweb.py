@@ -0,0 +1,66 @@
+import json
+from typing import Any, Dict, Mapping
+
+import httpclient
+
+# https://api.slack.com/web#basics
+BASE_URL = "https://slack.com/api/"
+
+
+class SlackResponse(Dict[str, Any]):
+    """Parsed Web API response: the JSON body, plus the HTTP status code and headers."""
+
+    def __init__(self, data: Mapping[str, Any], status_code: int, headers: Mapping[str, str]):
+        super().__init__(data)
+        self.status_code = status_code
+        self.headers = headers
+
+
+class SlackApiError(Exception):
+    """A Web API call that didn't return ok, like slack_sdk.errors.SlackApiError."""
+
+    def __init__(self, message: str, response: SlackResponse) -> None:
+        super().__init__(f"{message}\nThe server responded with: {dict(response)}")
+        self.response = response
+
+
+def _form_value(value: Any) -> str:
+    """Encode an argument for a form-encoded call: objects as JSON, booleans as Slack expects."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class WebClient:
+    """Minimal Slack Web API client on the shared HTTP session.
+
+    Implements only the methods somesy calls, so slack_sdk (which takes over
+    100ms to import) isn't needed on a cold start. Responses and errors mirror
+    slack_sdk's closely enough to be used interchangeably by slackc.
+    """
+
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    def api_call(self, method: str, **params: Any) -> SlackResponse:
+        response = httpclient.session().post(
+            f"{BASE_URL}{method}",
+            headers={"Authorization": f"Bearer {self.token}"},
+            data={k: _form_value(v) for k, v in params.items() if v is not None},
+        )
+        try:
+            data = response.json()
+        except ValueError:
+            data = {"ok": False, "error": f"http_{response.status_code}"}
+        result = SlackResponse(data, response.status_code, response.headers)
+        if not result.get("ok"):
+            raise SlackApiError(f"The request to the Slack API failed. (url: {method})", result)
+        return result
+
+    def conversations_history(self, **kwargs: Any) -> SlackResponse:
+        return self.api_call("conversations.history", **kwargs)
+
+    def chat_postMessage(self, **kwargs: Any) -> SlackResponse:
+        return self.api_call("chat.postMessage", **kwargs)
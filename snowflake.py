@@ -0,0 +1,46 @@
+import time
+from typing import Iterable, List, Optional, Union
+
+# LinkedIn activity IDs are Snowflake IDs: the creation time in milliseconds sits
+# in the top 41 bits of the 63-bit ID, so decoding is a right shift and the
+# smallest ID created at or after a given time is a left shift.
+TIMESTAMP_SHIFT = 22
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def timestamp_ms(activity_id: Union[str, int]) -> int:
+    """Unix timestamp (milliseconds) at which the activity was created."""
+    return int(activity_id) >> TIMESTAMP_SHIFT
+
+
+def min_activity_id(cutoff_ms: int) -> int:
+    """Smallest activity ID created at or after cutoff_ms."""
+    return cutoff_ms << TIMESTAMP_SHIFT
+
+
+def min_activity_id_for_age(max_age_in_hours: float, now: Optional[int] = None) -> int:
+    """Smallest activity ID at most max_age_in_hours old.
+
+    Checking whether an ID is in the window is then a single integer comparison.
+    """
+    if now is None:
+        now = now_ms()
+    return min_activity_id(now - int(max_age_in_hours * 3600 * 1000))
+
+
+def age_in_hours(activity_id: Union[str, int], now: Optional[int] = None) -> float:
+    if now is None:
+        now = now_ms()
+    return (now - timestamp_ms(activity_id)) / (1000 * 3600)
+
+
+def ages_in_hours(
+    activity_ids: Iterable[Union[str, int]], now: Optional[int] = None
+) -> List[float]:
+    """Ages of many activity IDs, all relative to the same `now`."""
+    if now is None:
+        now = now_ms()
+    return [age_in_hours(aid, now) for aid in activity_ids]
@@ -0,0 +1,110 @@
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+
+def activity_id_from_urn(urn: str) -> Optional[int]:
+    """Return the numeric Snowflake ID of an urn:li:activity URN, None for other URNs."""
+    prefix = "urn:li:activity:"
+    return int(urn[len(prefix) :]) if urn.startswith(prefix) else None
+
+
+def _covered_by(urn: str, watermark: int) -> bool:
+    activity_id = activity_id_from_urn(urn)
+    return activity_id is not None and activity_id <= watermark
+
+
+class StateStore:
+    """Remembers what has been synced to each Slack channel between runs.
+
+    Tracks the URNs posted to (or found in) a channel, the highest activity ID
+    synced (the watermark) and when the channel history was last reconciled
+    against Slack. This base class keeps the state in memory; subclasses
+    persist it.
+    """
+
+    def __init__(self, reconcile_interval_in_hours: float = 24) -> None:
+        self.reconcile_interval_in_hours = reconcile_interval_in_hours
+        self._urns: Dict[str, Set[str]] = {}
+        self._watermarks: Dict[str, int] = {}
+        self._reconciled_at: Dict[str, float] = {}
+
+    def watermark(self, channel_id: str) -> int:
+        return self._watermarks.get(channel_id, 0)
+
+    def posted_urns(self, channel_id: str) -> Set[str]:
+        return set(self._urns.get(channel_id, ()))
+
+    def is_known(self, channel_id: str, urns: Iterable[str]) -> bool:
+        """True if any of the URNs is recorded or at or below the watermark."""
+        known = self._urns.get(channel_id, set())
+        watermark = self.watermark(channel_id)
+        return any(urn in known or _covered_by(urn, watermark) for urn in urns)
+
+    def reconciliation_due(self, channel_id: str) -> bool:
+        age = time.time() - self._reconciled_at.get(channel_id, 0.0)
+        return age >= self.reconcile_interval_in_hours * 3600
+
+    def record(self, channel_id: str, urns: Iterable[str]) -> None:
+        """Record URNs as present in the channel and advance the watermark."""
+        known = self._urns.setdefault(channel_id, set())
+        watermark = self.watermark(channel_id)
+        for urn in urns:
+            known.add(urn)
+            activity_id = activity_id_from_urn(urn)
+            if activity_id is not None and activity_id > watermark:
+                watermark = activity_id
+        self._watermarks[channel_id] = watermark
+        # Activity URNs at or below the watermark are covered by it
+        self._urns[channel_id] = {urn for urn in known if not _covered_by(urn, watermark)}
+
+    def mark_reconciled(self, channel_id: str, urns: Iterable[str]) -> None:
+        """Record the URNs found by a full Slack history scan."""
+        self.record(channel_id, urns)
+        self._reconciled_at[channel_id] = time.time()
+
+    def save(self) -> None:
+        pass
+
+
+class JsonStateStore(StateStore):
+    """State store persisted to a local JSON file."""
+
+    def __init__(self, path: str, reconcile_interval_in_hours: float = 24) -> None:
+        super().__init__(reconcile_interval_in_hours)
+        self.path = path
+        if os.path.exists(path):
+            with open(path) as f:
+                data: Dict[str, Any] = json.load(f)
+            for channel_id, channel in data.get("channels", {}).items():
+                self._urns[channel_id] = set(channel["urns"])
+                self._watermarks[channel_id] = int(channel["watermark"])
+                self._reconciled_at[channel_id] = float(channel["reconciled_at"])
+
+    def save(self) -> None:
+        channels = {
+            channel_id: {
+                "urns": sorted(self._urns.get(channel_id, ())),
+                "watermark": self.watermark(channel_id),
+                "reconciled_at": self._reconciled_at.get(channel_id, 0.0),
+            }
+            for channel_id in self._urns.keys() | self._reconciled_at.keys()
+        }
+        # Write to a temp file first, so a crash never leaves a truncated state file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"channels": channels}, f)
+        os.replace(tmp_path, self.path)
+
+
+def state_store_from_env(in_memory: bool = False) -> Optional[StateStore]:
+    """Return the state store configured via SOMESY_STATE_FILE.
+
+    If not set, return None, or an in-memory store if in_memory is set.
+    """
+    path = os.getenv("SOMESY_STATE_FILE")
+    interval = float(os.getenv("SOMESY_RECONCILE_INTERVAL_HOURS", "24"))
+    if not path:
+        return StateStore(reconcile_interval_in_hours=interval) if in_memory else None
+    return JsonStateStore(path, reconcile_interval_in_hours=interval)
@@ -1,12 +1,158 @@
-import linkedin
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+import httpcache
+import leases
+import pipeline
+import posts
+import resilience
+import routing
 import slackc
+import state
+import telemetry
+import urns
+
+
+def channel_posts(
+    channel_id: str, routes: List[routing.Route], posts_by_org: Dict[str, List[posts.Post]]
+) -> List[posts.Post]:
+    """LinkedIn posts routed to a channel, oldest first."""
+    org_ids = [r.org_id for r in routes if r.channel_id == channel_id]
+    by_urn = {post.urn: post for org_id in org_ids for post in posts_by_org[org_id]}
+    channel = list(by_urn.values())
+    if len(org_ids) > 1:
+        channel.sort(key=lambda post: post.created_at)
+    return channel
+
+
+def new_posts(candidates: List[posts.Post], posted: Set[str]) -> List[posts.Post]:
+    """The posts, in order, whose URNs aren't among the posted URNs."""
+    # Voyager yields activity URNs, the official API share/ugcPost URNs: resolve
+    # between them when both forms are present, so dedup works across sources
+    mapping = urns.equivalence_map(posted, {post.urn for post in candidates})
+    posted = urns.with_equivalents(posted, mapping)
+    new = [
+        post for post in candidates if posted.isdisjoint(urns.with_equivalents({post.urn}, mapping))
+    ]
+    telemetry.count("sync.duplicates", len(candidates) - len(new))
+    return new
+
+
+def _sync_channel(
+    max_age_in_hours: int,
+    channel_id: str,
+    candidates: List[posts.Post],
+    posted: Optional[Set[str]],
+    store: Optional[state.StateStore],
+    deadline: Optional[resilience.Deadline] = None,
+    lease_store: Optional[leases.LeaseStore] = None,
+) -> None:
+    """Post the LinkedIn posts missing from a channel.
+
+    posted is the channel's dedup index, or None if the history wasn't scanned
+    up front because the state store was trusted instead.
+    """
+    telemetry.count("sync.candidates", len(candidates))
+    if store is not None:
+        if posted is not None:
+            store.mark_reconciled(channel_id, posted)
+        else:
+            known = len(candidates)
+            candidates = [post for post in candidates if not store.is_known(channel_id, [post.urn])]
+            telemetry.count("sync.known_to_state", known - len(candidates))
+    if not candidates:
+        return
+
+    if posted is None:
+        # Cache miss: the Slack history wasn't fetched up front
+        if deadline is not None:
+            deadline.check("scanning Slack history")
+        posted = pipeline.posted_urns_in_channel(max_age_in_hours, channel_id)
+        if store is not None:
+            store.mark_reconciled(channel_id, posted)
+
+    outcomes = slackc.post_slack_messages(
+        posts.urls(new_posts(candidates, posted)), channel_id, deadline, lease_store
+    )
+    if store is not None:
+        for outcome in outcomes:
+            if outcome.status == slackc.POSTED:
+                store.record(channel_id, slackc.urns_in_text(outcome.message))
+    failed = [o for o in outcomes if o.status not in (slackc.POSTED, slackc.CLAIMED)]
+    if failed:
+        raise Exception(
+            f"Posting to Slack channel {channel_id} failed, "
+            f"{len(failed)} of {len(outcomes)} posts not synced: {failed[0].error}"
+        )
+
+
+def linkedin_to_slack(
+    max_age_in_hours: int = 24,
+    store: Optional[state.StateStore] = None,
+    routes: Optional[List[routing.Route]] = None,
+    deadline: Optional[resilience.Deadline] = None,
+    lease_store: Optional[leases.LeaseStore] = None,
+) -> Dict[str, List[posts.Post]]:
+    """Sync LinkedIn posts to Slack and return the posts fetched, by organization.
+
+    Routes (passed in or configured via SOMESY_ROUTES) map organizations to
+    channels. Each organization's posts and each channel's history are fetched
+    once, concurrently, and channels are then synced in parallel.
+
+    With a state store (passed in or configured via SOMESY_STATE_FILE), posts
+    already known to be in a channel are dropped without calling Slack; the
+    channel history is only scanned on a cache miss or when a periodic
+    reconciliation is due.
 
+    The deadline (passed in or configured via SOMESY_DEADLINE_SECONDS) bounds
+    the whole run: fetching may use part of it, and posts that don't fit in
+    the rest are left for the next run.
 
-def linkedin_to_slack(max_age_in_hours: int = 24) -> None:
-    """Sync LinkedIn posts to Slack."""
-    slack_texts = [m.get("text", "") for m in slackc.slack_messages()]
-    post_urls = linkedin.recent_post_urls(max_age_in_hours)
+    With a lease store (passed in or configured via SOMESY_LEASE_FILE), each
+    post is claimed before it's sent, so overlapping invocations (at least
+    once Pub/Sub delivery, concurrent instances) don't post it twice.
+    """
+    if store is None:
+        store = state.state_store_from_env()
+    if routes is None:
+        routes = routing.routes_from_env()
+    if deadline is None:
+        deadline = resilience.deadline_from_env()
+    if lease_store is None:
+        lease_store = leases.lease_store_from_env()
+    org_ids = list(dict.fromkeys(r.org_id for r in routes))
+    channel_ids = list(dict.fromkeys(r.channel_id for r in routes))
 
-    for url in post_urls:
-        if not any(url in text for text in slack_texts):
-            slackc.post_slack_message(url)
+    reconcile_channel_ids = [c for c in channel_ids if store is None or store.reconciliation_due(c)]
+    telemetry.reset_counters()
+    try:
+        with telemetry.span("sync", orgs=len(org_ids), channels=len(channel_ids)):
+            posts_by_org, posted_by_channel = pipeline.fetch(
+                max_age_in_hours, org_ids, reconcile_channel_ids, deadline
+            )
+            with ThreadPoolExecutor(max_workers=pipeline.MAX_WORKERS) as pool:
+                futures = [
+                    pool.submit(
+                        _sync_channel,
+                        max_age_in_hours,
+                        channel_id,
+                        channel_posts(channel_id, routes, posts_by_org),
+                        posted_by_channel.get(channel_id),
+                        store,
+                        deadline,
+                        lease_store,
+                    )
+                    for channel_id in channel_ids
+                ]
+            errors = [e for e in (f.exception() for f in futures) if e is not None]
+            if len(errors) == 1:
+                raise errors[0]
+            if errors:
+                raise Exception(f"Sync failed for {len(errors)} channels: {errors}")
+            return posts_by_org
+    finally:
+        if store is not None:
+            store.save()
+        httpcache.save()
+        resilience.voyager_breaker().save()
+        telemetry.log_counters("Sync counters")
@@ -0,0 +1,150 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+# A sink receives one structured log record (a JSON-serializable dict) at a time
+Sink = Callable[[Dict[str, Any]], None]
+
+
+def stdout_sink(record: Dict[str, Any]) -> None:
+    """Write the record as one JSON line; Cloud Logging parses severity and message from it."""
+    sys.stdout.write(json.dumps(record, default=str) + "\n")
+    sys.stdout.flush()
+
+
+def _sink_from_env() -> Optional[Sink]:
+    if os.getenv("SOMESY_TELEMETRY", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    return stdout_sink
+
+
+_sink: Optional[Sink] = _sink_from_env()
+_counters: "Counter[str]" = Counter()
+_counters_lock = threading.Lock()
+
+
+def set_sink(sink: Optional[Sink]) -> Optional[Sink]:
+    """Route records to sink (None disables telemetry). Returns the previous sink."""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def enabled() -> bool:
+    """Whether records are emitted; lets callers skip building expensive fields."""
+    return _sink is not None
+
+
+def log(message: str, severity: str = "INFO", **fields: Any) -> None:
+    """Emit a structured log record. Severity uses Cloud Logging's names."""
+    sink = _sink
+    if sink is None:
+        return
+    sink({"severity": severity, "message": message, **fields})
+
+
+def log_http(method: str, url: str, status: int, latency_seconds: float) -> None:
+    """Emit a record for one HTTP call in Cloud Logging's httpRequest format."""
+    if _sink is None:
+        return
+    log(
+        "HTTP request",
+        severity="INFO" if status < 400 else "WARNING",
+        httpRequest={
+            "requestMethod": method,
+            "requestUrl": url,
+            "status": status,
+            "latency": f"{latency_seconds:.3f}s",
+        },
+    )
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a named counter, reported by log_counters()."""
+    if _sink is None:
+        return
+    with _counters_lock:
+        _counters[name] += n
+
+
+def counters() -> Dict[str, int]:
+    with _counters_lock:
+        return dict(_counters)
+
+
+def reset_counters() -> None:
+    with _counters_lock:
+        _counters.clear()
+
+
+def log_counters(message: str, **fields: Any) -> None:
+    """Emit the counters collected so far as one record and reset them."""
+    if _sink is None:
+        return
+    with _counters_lock:
+        snapshot = dict(_counters)
+        _counters.clear()
+    log(message, counters=snapshot, **fields)
+
+
+class Span:
+    """Times a phase; emits one record with its duration when the phase ends.
+
+    Fields passed to set() while the phase runs are added to the record. A
+    phase ending with an exception is logged at ERROR severity with the error.
+    """
+
+    def __init__(self, phase: str, fields: Dict[str, Any]) -> None:
+        self.phase = phase
+        self.fields = fields
+        self._start = 0.0
+
+    def set(self, **fields: Any) -> None:
+        self.fields.update(fields)
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        duration_ms = round((time.perf_counter() - self._start) * 1000, 1)
+        if exc is None:
+            log(f"{self.phase} done", phase=self.phase, duration_ms=duration_ms, **self.fields)
+        else:
+            log(
+                f"{self.phase} failed",
+                severity="ERROR",
+                phase=self.phase,
+                duration_ms=duration_ms,
+                error=repr(exc),
+                **self.fields,
+            )
+
+
+class _NullSpan(Span):
+    def __init__(self) -> None:
+        super().__init__("", {})
+
+    def set(self, **fields: Any) -> None:
+        pass
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        pass
+
+
+# Shared, since it keeps no state: disabled telemetry creates no span objects
+_NULL_SPAN = _NullSpan()
+
+
+def span(phase: str, **fields: Any) -> Span:
+    """Context manager timing a phase, e.g. `with telemetry.span("voyager", org_id=org_id):`."""
+    if _sink is None:
+        return _NULL_SPAN
+    return Span(phase, fields)
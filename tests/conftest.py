@@ -0,0 +1,24 @@
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+import cache
+import httpcache
+import resilience
+
+
+@pytest.fixture(autouse=True)
+def fresh_http_cache() -> Generator[cache.LRUCache, None, None]:
+    # Responses mocked by one test must never be served from the cache in another
+    lru = cache.LRUCache(max_size=httpcache.CACHE_MAX_SIZE, ttl_seconds=httpcache.MAX_AGE_SECONDS)
+    with patch.object(httpcache, "_cache", lru):
+        yield lru
+
+
+@pytest.fixture(autouse=True)
+def fresh_voyager_breaker() -> Generator[resilience.CircuitBreaker, None, None]:
+    # Voyager failures in one test must not open the circuit for the next
+    breaker = resilience.CircuitBreaker()
+    with patch.object(resilience, "_voyager_breaker", breaker):
+        yield breaker
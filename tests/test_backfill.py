@@ -0,0 +1,133 @@
+import json
+import os
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import backfill
+import snowflake
+from posts import Post
+from routing import Route
+
+HOUR_MS = 3600 * 1000
+NOW_MS = snowflake.now_ms()
+
+
+def post(hours_ago: float, org: int = 0) -> Post:
+    return Post.from_activity_id(snowflake.min_activity_id(NOW_MS - int(hours_ago * HOUR_MS)) + org)
+
+
+def post_url(hours_ago: float, org: int = 0) -> str:
+    return post(hours_ago, org).url
+
+
+def test_split_windows() -> None:
+    windows = backfill.split_windows(0, 5 * HOUR_MS, window_hours=2)
+    assert windows == [
+        backfill.Window(0, 2 * HOUR_MS),
+        backfill.Window(2 * HOUR_MS, 4 * HOUR_MS),
+        backfill.Window(4 * HOUR_MS, None),
+    ]
+    assert backfill.split_windows(HOUR_MS, HOUR_MS) == []
+
+
+def test_window_contains_by_snowflake_id() -> None:
+    window = backfill.Window(NOW_MS - 2 * HOUR_MS, NOW_MS - HOUR_MS)
+    assert window.contains(window.min_id)
+    assert not window.contains(window.min_id - 1)
+    assert window.max_id is not None and not window.contains(window.max_id)
+    assert backfill.Window(NOW_MS, None).contains(snowflake.min_activity_id(NOW_MS + HOUR_MS))
+
+
+def test_checkpoint_resumes_same_range_only(tmp_path: Any) -> None:
+    path = str(tmp_path / "checkpoint.json")
+    window = backfill.Window(0, HOUR_MS)
+    checkpoint = backfill.Checkpoint(path, 48, 24, now_ms=1000)
+    checkpoint.record_scan("C1", window, {"urn:li:activity:1"})
+    checkpoint.record_post("C1", ["urn:li:activity:2"])
+
+    resumed = backfill.Checkpoint(path, 48, 24, now_ms=2000)
+    assert resumed.started_at_ms == 1000
+    assert resumed.scanned("C1", window) == {"urn:li:activity:1"}
+    assert resumed.scanned("C1", backfill.Window(HOUR_MS, None)) is None
+    assert resumed.posted("C1") == {"urn:li:activity:2"}
+
+    other = backfill.Checkpoint(path, 72, 24, now_ms=2000)
+    assert other.started_at_ms == 2000
+    assert other.posted("C1") == set()
+
+    resumed.remove()
+    assert not os.path.exists(path)
+
+
+@pytest.fixture
+def routes() -> List[Route]:
+    return [Route(org_id="1", channel_id="C1"), Route(org_id="2", channel_id="C1")]
+
+
+def history(messages_by_range: Dict[Optional[float], List[Dict[str, str]]]) -> Any:
+    """Fake slack_messages serving messages by the latest bound of the requested range."""
+
+    def slack_messages(
+        channel_id: str, oldest: float, latest: Optional[float]
+    ) -> List[Dict[str, str]]:
+        return messages_by_range.get(latest and round(latest), [])
+
+    return slack_messages
+
+
+def test_backfill_posts_oldest_first_across_orgs(routes: List[Route], tmp_path: Any) -> None:
+    path = str(tmp_path / "checkpoint.json")
+    org_1 = [post(1, org=1), post(30, org=1)]
+    org_2 = [post(10, org=2), post(50, org=2), post(100, org=2)]
+    already_posted = {"text": post_url(10, org=2)}
+
+    with (
+        patch("backfill.pipeline.fetch", return_value=({"1": org_1, "2": org_2}, {})) as fetch,
+        patch("backfill.slackc.slack_messages", side_effect=history({None: [already_posted]})),
+        patch("backfill.slackc.post_slack_message") as post_message,
+    ):
+        backfill.backfill(72, checkpoint_path=path, routes=routes)
+
+    assert fetch.call_args.args[1:] == (["1", "2"], [])
+    # 100 hours ago is out of range, 10 hours ago already in Slack
+    assert [c.args for c in post_message.call_args_list] == [
+        (post_url(50, org=2), "C1"),
+        (post_url(30, org=1), "C1"),
+        (post_url(1, org=1), "C1"),
+    ]
+    assert not os.path.exists(path)
+
+
+def test_backfill_resumes_from_checkpoint(routes: List[Route], tmp_path: Any) -> None:
+    path = str(tmp_path / "checkpoint.json")
+    posts = {"1": [post(5, org=1), post(40, org=1)], "2": [post(60, org=2)]}
+    post_message = MagicMock(side_effect=[None, Exception("Slack is down")])
+
+    with (
+        patch("backfill.pipeline.fetch", return_value=(posts, {})),
+        patch("backfill.slackc.slack_messages", side_effect=history({})) as slack_messages,
+        patch("backfill.slackc.post_slack_message", post_message),
+    ):
+        with pytest.raises(Exception, match="Slack is down"):
+            backfill.backfill(72, checkpoint_path=path, routes=routes)
+        # 3 daily windows scanned, the 2 closed ones checkpointed
+        assert slack_messages.call_count == 3
+        with open(path) as f:
+            data = json.load(f)
+        assert len(data["channels"]["C1"]["scanned"]) == 2
+        assert len(data["channels"]["C1"]["posted"]) == 1
+
+        slack_messages.reset_mock()
+        post_message.reset_mock(side_effect=True)
+        backfill.backfill(72, checkpoint_path=path, routes=routes)
+
+    # Only the open-ended newest window is rescanned, and posting picks up where it failed
+    assert slack_messages.call_count == 1
+    assert slack_messages.call_args.kwargs["latest"] is None
+    assert [c.args for c in post_message.call_args_list] == [
+        (post_url(40, org=1), "C1"),
+        (post_url(5, org=1), "C1"),
+    ]
+    assert not os.path.exists(path)
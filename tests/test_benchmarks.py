@@ -0,0 +1,31 @@
+from benchmarks import bench_sync
+
+
+def test_run_small_scenario() -> None:
+    scenario = bench_sync.Scenario(messages=500, posts=30, included_per_post=5, orgs=2, channels=2)
+
+    results = bench_sync.run(scenario)
+
+    assert set(results) == {"slack_history", "voyager", "official_api", "sync"}
+    assert results["slack_history"].calls == 3
+    assert results["voyager"].calls == 4
+    assert results["sync"].calls > 0
+    assert all(r.bytes > 0 and r.peak_memory_kb > 0 for r in results.values())
+
+
+def test_regressions() -> None:
+    base = {"latency_ms": 100.0, "calls": 10, "bytes": 1000, "peak_memory_kb": 100.0}
+    results = {
+        "same": bench_sync.PhaseResult(
+            latency_ms=150.0, calls=10, bytes=1000, peak_memory_kb=100.0
+        ),
+        "worse": bench_sync.PhaseResult(
+            latency_ms=1000.0, calls=11, bytes=2000, peak_memory_kb=200.0
+        ),
+        "new": bench_sync.PhaseResult(latency_ms=1.0, calls=1, bytes=1, peak_memory_kb=1.0),
+    }
+
+    problems = bench_sync.regressions(results, {"same": base, "worse": base})
+
+    assert len(problems) == 4
+    assert all(p.startswith("worse:") for p in problems)
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import cache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    lru = cache.LRUCache(max_size=2)
+    lru.put("a", 1)
+    lru.put("b", 2)
+    assert lru.get("a") == 1  # "b" is now the least recently used
+    lru.put("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert len(lru) == 2
+
+
+def test_lru_cache_expires_entries() -> None:
+    clock = FakeClock()
+    lru = cache.LRUCache(ttl_seconds=60, clock=clock)
+    lru.put("a", 1)
+
+    clock.now += 59
+    assert lru.get("a") == 1
+    clock.now += 1
+    assert lru.get("a") is None
+    assert len(lru) == 0
+
+
+def test_lru_cache_persists(tmp_path: Path) -> None:
+    clock = FakeClock()
+    path = str(tmp_path / "cache.json")
+    lru = cache.LRUCache(ttl_seconds=60, path=path, clock=clock)
+    lru.put("a", "x")
+    clock.now += 30
+    lru.put("b", "y")
+    lru.save()
+
+    assert cache.LRUCache(ttl_seconds=60, path=path, clock=clock).get("a") == "x"
+
+    # Entries expired in the meantime are dropped on load
+    clock.now += 40
+    loaded = cache.LRUCache(ttl_seconds=60, path=path, clock=clock)
+    assert loaded.get("a") is None
+    assert loaded.get("b") == "y"
+
+
+def test_lru_cache_save_without_path() -> None:
+    lru = cache.LRUCache()
+    lru.put("a", 1)
+    lru.save()
@@ -0,0 +1,119 @@
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import requests
+import responses
+from requests.adapters import HTTPAdapter
+
+import cassette
+import httpclient
+import slackc
+import slackweb
+
+VOYAGER_URL = "https://www.linkedin.com/voyager/api/graphql?variables=(start:0)"
+
+
+def _session(mode: str, path: Path, latency_ms: str = "0") -> requests.Session:
+    env = {
+        "SOMESY_HTTP_CASSETTE_MODE": mode,
+        "SOMESY_HTTP_CASSETTE_FILE": str(path),
+        "SOMESY_HTTP_REPLAY_LATENCY_MS": latency_ms,
+    }
+    with patch.dict(os.environ, env):
+        session = requests.Session()
+        session.mount("https://", cassette.adapter_from_env(HTTPAdapter()))
+    return session
+
+
+@responses.activate
+def test_record_then_replay(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    responses.add(
+        responses.GET,
+        VOYAGER_URL,
+        body=b'{"included": [1]}',
+        headers={"Set-Cookie": "lang=en", "ETag": '"v1"'},
+    )
+    responses.add(responses.GET, VOYAGER_URL, body=b'{"included": [2]}')
+    responses.add(responses.POST, "https://slack.com/api/chat.postMessage", body=b"\xff\xfe")
+
+    recorder = _session(cassette.RECORD, path)
+    with recorder.get(VOYAGER_URL, headers={"csrf-token": "secret"}, stream=True) as r:
+        assert b"".join(r.iter_content(4)) == b'{"included": [1]}'
+    recorder.get(VOYAGER_URL)
+    recorder.post("https://slack.com/api/chat.postMessage", data={"text": "hi"})
+
+    recorded = path.read_text()
+    assert "secret" not in recorded
+    assert "lang=en" not in recorded
+    assert len(recorded.splitlines()) == 3
+
+    responses.reset()
+    replayer = _session(cassette.REPLAY, path)
+    first = replayer.get(VOYAGER_URL)
+    assert first.json() == {"included": [1]}
+    assert first.headers["ETag"] == '"v1"'
+    # Repeated requests replay in recorded order, then the last response repeats
+    assert replayer.get(VOYAGER_URL).json() == {"included": [2]}
+    assert replayer.get(VOYAGER_URL).json() == {"included": [2]}
+    assert (
+        replayer.post("https://slack.com/api/chat.postMessage", data={"text": "hi"}).content
+        == b"\xff\xfe"
+    )
+    # Nothing reached the (mocked) network during replay
+    assert len(responses.calls) == 0
+
+
+def test_replay_miss(tmp_path: Path) -> None:
+    replayer = _session(cassette.REPLAY, tmp_path / "empty.jsonl")
+
+    with pytest.raises(cassette.CassetteMiss, match="No recorded response for GET"):
+        replayer.get(VOYAGER_URL)
+    replayer.close()
+
+
+@responses.activate
+def test_replay_latency(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    responses.add(responses.GET, VOYAGER_URL, body=b"{}")
+    _session(cassette.RECORD, path).get(VOYAGER_URL)
+
+    replayer = _session(cassette.REPLAY, path, latency_ms="50")
+    start = time.monotonic()
+    replayer.get(VOYAGER_URL)
+
+    assert time.monotonic() - start >= 0.05
+
+
+def test_passthrough_keeps_adapter() -> None:
+    inner = HTTPAdapter()
+    assert cassette.adapter_from_env(inner) is inner
+
+
+@pytest.mark.parametrize(
+    "env,error",
+    [
+        ({"SOMESY_HTTP_CASSETTE_MODE": "rewind"}, "Invalid SOMESY_HTTP_CASSETTE_MODE"),
+        ({"SOMESY_HTTP_CASSETTE_MODE": "replay"}, "SOMESY_HTTP_CASSETTE_FILE is required"),
+    ],
+)
+def test_invalid_configuration(env: dict, error: str) -> None:
+    with patch.dict(os.environ, env):
+        os.environ.pop("SOMESY_HTTP_CASSETTE_FILE", None)
+        with pytest.raises(ValueError, match=error):
+            cassette.adapter_from_env(HTTPAdapter())
+
+
+def test_shared_session_and_slack_client_use_cassette(tmp_path: Path) -> None:
+    env = {
+        "SOMESY_HTTP_CASSETTE_MODE": cassette.REPLAY,
+        "SOMESY_HTTP_CASSETTE_FILE": str(tmp_path / "cassette.jsonl"),
+        "SLACK_TOKEN": "test-token",
+    }
+    with patch.dict(os.environ, env), patch.object(httpclient, "_session", None):
+        adapter = httpclient.session().get_adapter("https://slack.com")
+        assert isinstance(adapter, cassette.CassetteAdapter)
+        assert isinstance(slackc.slack_client(), slackweb.WebClient)
@@ -0,0 +1,74 @@
+import threading
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import daemon
+import state
+from posts import Post
+from routing import Route
+
+HOUR_MS = 3600 * 1000
+DAY_MS = 24 * HOUR_MS
+ROUTES = [Route(org_id="1", channel_id="C1")]
+
+
+def test_poll_schedule_polls_often_until_posts_are_observed() -> None:
+    schedule = daemon.PollSchedule(min_interval=60, max_interval=3600)
+    assert schedule.interval(now_ms=0) == 60
+
+
+def test_poll_schedule_adapts_to_posting_hours() -> None:
+    schedule = daemon.PollSchedule(min_interval=60, max_interval=3600)
+    # Posts at 9:00 UTC on three days, and at 14:30 once
+    schedule.observe([day * DAY_MS + 9 * HOUR_MS for day in range(3)])
+    schedule.observe([14 * HOUR_MS + HOUR_MS // 2, 9 * HOUR_MS])
+
+    assert schedule.interval(now_ms=9 * HOUR_MS) == 60
+    assert schedule.interval(now_ms=3 * HOUR_MS) == 3600
+    # Neighbouring hours count too, so 15:00 backs off less than quiet hours
+    assert 60 < schedule.interval(now_ms=15 * HOUR_MS) < 3600
+
+
+def test_poll_schedule_wakes_up_for_busier_hour() -> None:
+    schedule = daemon.PollSchedule(min_interval=60, max_interval=3600)
+    schedule.observe([9 * HOUR_MS])
+
+    # 7:50 is quiet, but 8:00 borders on the posting hour
+    assert schedule.interval(now_ms=7 * HOUR_MS + 50 * 60 * 1000) == 600
+
+
+def test_run_keeps_state_between_cycles() -> None:
+    store = state.StateStore()
+    schedule = MagicMock(spec=daemon.PollSchedule)
+    schedule.interval.return_value = 0
+    post = Post.from_activity_id(7413922466504495104)
+    with patch("daemon.sync.linkedin_to_slack", return_value={"1": [post]}) as sync:
+        daemon.run(routes=ROUTES, store=store, schedule=schedule, cycles=2)
+
+    assert sync.call_count == 2
+    for call in sync.call_args_list:
+        assert call.args == (48, store, ROUTES)
+    # Creation times of the fetched posts feed the cadence
+    assert [list(c.args[0]) for c in schedule.observe.call_args_list] == [[1767616860033]] * 2
+
+
+def test_run_survives_failed_cycles() -> None:
+    schedule = daemon.PollSchedule(min_interval=0, max_interval=0)
+    sync = MagicMock(side_effect=[Exception("LinkedIn is down"), {}])
+    with patch("daemon.sync.linkedin_to_slack", sync):
+        daemon.run(routes=ROUTES, store=state.StateStore(), schedule=schedule, cycles=2)
+
+    assert sync.call_count == 2
+
+
+def test_run_stops_when_signalled() -> None:
+    stop = threading.Event()
+
+    def linkedin_to_slack(*args: Any) -> Any:
+        stop.set()
+        return {}
+
+    with patch("daemon.sync.linkedin_to_slack", side_effect=linkedin_to_slack) as sync:
+        daemon.run(routes=ROUTES, store=state.StateStore(), stop=stop)
+
+    sync.assert_called_once()
@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+import requests
+import responses
+from responses import matchers
+
+import cache
+import httpcache
+
+URL = "https://api.linkedin.com/rest/posts?q=author&start=0"
+
+# Status codes of the responses parse() was called for
+parsed: List[int] = []
+
+
+def parse(response: requests.Response) -> Any:
+    if response.status_code != 200:
+        raise Exception(f"status {response.status_code}")
+    parsed.append(response.status_code)
+    return response.json()
+
+
+@pytest.fixture(autouse=True)
+def reset_parsed() -> None:
+    parsed.clear()
+
+
+@responses.activate
+def test_reuses_result_within_ttl() -> None:
+    responses.add(responses.GET, URL, json={"elements": [1]})
+
+    assert httpcache.get(URL, parse) == {"elements": [1]}
+    assert httpcache.get(URL, parse) == {"elements": [1]}
+
+    assert len(responses.calls) == 1
+    assert parsed == [200]
+
+
+@responses.activate
+def test_refetches_after_ttl() -> None:
+    responses.add(responses.GET, URL, json={"elements": [1]})
+
+    with patch.dict(os.environ, {"SOMESY_HTTP_CACHE_TTL_SECONDS": "0"}):
+        httpcache.get(URL, parse)
+        httpcache.get(URL, parse)
+
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_revalidates_with_etag() -> None:
+    responses.add(responses.GET, URL, json={"elements": [1]}, headers={"ETag": '"v1"'})
+    responses.add(
+        responses.GET,
+        URL,
+        status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"v1"', "X-Custom": "1"})],
+    )
+
+    assert httpcache.get(URL, parse) == {"elements": [1]}
+    assert httpcache.get(URL, parse, headers={"X-Custom": "1"}) == {"elements": [1]}
+
+    assert len(responses.calls) == 2
+    assert parsed == [200]
+
+
+@responses.activate
+def test_revalidates_with_last_modified_and_replaces_changed_result() -> None:
+    last_modified = "Wed, 21 Oct 2026 07:28:00 GMT"
+    responses.add(
+        responses.GET, URL, json={"elements": [1]}, headers={"Last-Modified": last_modified}
+    )
+    responses.add(
+        responses.GET,
+        URL,
+        json={"elements": [1, 2]},
+        match=[matchers.header_matcher({"If-Modified-Since": last_modified})],
+    )
+
+    httpcache.get(URL, parse)
+
+    assert httpcache.get(URL, parse) == {"elements": [1, 2]}
+    assert parsed == [200, 200]
+
+
+@responses.activate
+def test_errors_are_not_cached() -> None:
+    responses.add(responses.GET, URL, status=500)
+    responses.add(responses.GET, URL, json={"elements": []})
+
+    with pytest.raises(Exception, match="status 500"):
+        httpcache.get(URL, parse)
+
+    assert httpcache.get(URL, parse) == {"elements": []}
+
+
+@responses.activate
+def test_persisted_to_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "http-cache.json")
+    responses.add(responses.GET, URL, json={"elements": [1]}, headers={"ETag": '"v1"'})
+
+    with (
+        patch.object(httpcache, "_cache", None),
+        patch.dict(os.environ, {"SOMESY_HTTP_CACHE_FILE": path}),
+    ):
+        httpcache.get(URL, parse)
+        httpcache.save()
+
+    entry = cache.LRUCache(path=path).get(URL)
+    assert entry is not None and entry["etag"] == '"v1"'
+
+
+def test_save_without_cache() -> None:
+    with patch.object(httpcache, "_cache", None):
+        httpcache.save()
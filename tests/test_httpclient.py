@@ -0,0 +1,40 @@
+import responses
+from requests.adapters import HTTPAdapter
+
+import httpclient
+
+
+def test_session_is_reused() -> None:
+    assert httpclient.session() is httpclient.session()
+
+
+def test_session_connection_pool() -> None:
+    adapter = httpclient.session().get_adapter("https://www.linkedin.com")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == httpclient.POOL_MAXSIZE  # type: ignore[attr-defined]
+
+
+@responses.activate
+def test_session_does_not_store_server_cookies() -> None:
+    responses.add(
+        responses.GET,
+        "https://www.linkedin.com/voyager/api/graphql",
+        status=200,
+        headers={"Set-Cookie": "lang=v=2&lang=en-us; Domain=.linkedin.com; Path=/"},
+    )
+
+    httpclient.session().get("https://www.linkedin.com/voyager/api/graphql", cookies={"a": "b"})
+
+    assert len(httpclient.session().cookies) == 0
+
+
+@responses.activate
+def test_session_applies_default_timeouts() -> None:
+    responses.add(responses.GET, "https://www.linkedin.com/voyager/api/graphql")
+    responses.add(responses.GET, "https://api.linkedin.com/rest/posts")
+
+    httpclient.session().get("https://www.linkedin.com/voyager/api/graphql")
+    httpclient.session().get("https://api.linkedin.com/rest/posts", timeout=3)
+
+    timeouts = [c.request.req_kwargs["timeout"] for c in responses.calls]  # type: ignore[attr-defined]
+    assert timeouts == [(httpclient.CONNECT_TIMEOUT, httpclient.READ_TIMEOUT), 3]
@@ -1,3 +1,4 @@
+import json
 import os
 from datetime import datetime, timedelta
 from unittest.mock import patch
@@ -6,6 +7,7 @@ import pytest
 import responses
 
 import linkedin
+import posts
 
 
 from typing import Any, Dict, Generator, List
@@ -41,18 +43,6 @@ def mock_linkedin_response() -> Dict[str, List[Dict[str, Any]]]:
     }
 
 
-def test_age_in_hours() -> None:
-    # Test with a post from 5 hours ago
-    now = datetime.now()
-    post_time = int((now - timedelta(hours=5)).timestamp() * 1000)
-    post = {"createdAt": post_time}
-
-    age = linkedin.age_in_hours(post)
-
-    # Allow some wiggle room for test execution time
-    assert 4.9 < age < 5.1
-
-
 def test_timestamp_from_activity_id() -> None:
     # Test extracting timestamp from a known activity ID
     # Activity ID 7413922466504495104 was posted around Dec 31, 2025
@@ -72,11 +62,6 @@ def test_age_in_hours_from_activity_id() -> None:
     assert -0.1 < age < 0.1
 
 
-def test_is_in_main_feed() -> None:
-    assert linkedin.is_in_main_feed({"distribution": {"feedDistribution": "MAIN_FEED"}}) is True
-    assert linkedin.is_in_main_feed({"distribution": {"feedDistribution": "NONE"}}) is False
-
-
 @responses.activate
 def test_recent_official_api_posts(
     mock_env_vars: None, mock_linkedin_response: Dict[str, List[Dict[str, Any]]]
@@ -84,7 +69,7 @@ def test_recent_official_api_posts(
     # Setup mock response
     responses.add(
         responses.GET,
-        "https://api.linkedin.com/rest/posts?author=urn%3Ali%3Aorganization%3A12345&q=author&count=10&sortBy=CREATED",
+        "https://api.linkedin.com/rest/posts?author=urn%3Ali%3Aorganization%3A12345&q=author&start=0&count=10&sortBy=CREATED",
         json=mock_linkedin_response,
         status=200,
     )
@@ -94,7 +79,8 @@ def test_recent_official_api_posts(
 
     # Should only return the first post (recent and in main feed)
     assert len(posts) == 1
-    assert posts[0]["id"] == "post-1"
+    assert posts[0].urn == "post-1"
+    assert posts[0].feed_distribution == "MAIN_FEED"
 
 
 @responses.activate
@@ -102,7 +88,7 @@ def test_linkedin_api_error(mock_env_vars: None) -> None:
     # Mock a failed API response
     responses.add(
         responses.GET,
-        "https://api.linkedin.com/rest/posts?author=urn%3Ali%3Aorganization%3A12345&q=author&count=10&sortBy=CREATED",
+        "https://api.linkedin.com/rest/posts?author=urn%3Ali%3Aorganization%3A12345&q=author&start=0&count=10&sortBy=CREATED",
         json={"message": "API error"},
         status=401,
     )
@@ -174,7 +160,7 @@ def test_recent_voyager_posts(
     # Should return posts within 49h (1h and 48h), sorted oldest first (numerically)
     test_ids = mock_voyager_response["_test_ids"]
     assert len(posts) == 2
-    assert posts == sorted([test_ids["1h"], test_ids["2d"]], key=int)
+    assert [str(p.activity_id) for p in posts] == sorted([test_ids["1h"], test_ids["2d"]], key=int)
 
 
 @responses.activate
@@ -215,7 +201,7 @@ def test_recent_voyager_posts_sorted_oldest_first(mock_voyager_env_vars: None) -
     posts = linkedin.recent_voyager_posts(max_age_in_hours=24)
 
     # Should be sorted oldest first: 5h ago, 3h ago, 1h ago
-    assert posts == [id_5h_ago, id_3h_ago, id_1h_ago]
+    assert [str(p.activity_id) for p in posts] == [id_5h_ago, id_3h_ago, id_1h_ago]
 
 
 @responses.activate
@@ -236,9 +222,112 @@ def test_recent_voyager_posts_api_error(mock_voyager_env_vars: None) -> None:
     assert "See README.md for troubleshooting" in str(e.value)
 
 
+def _voyager_page_response(activity_ids: List[str]) -> Dict[str, Any]:
+    return {
+        "included": [
+            {
+                "entityUrn": f"urn:li:fsd_update:(urn:li:activity:{aid},COMPANY_FEED_ADMIN,EMPTY,DEFAULT,false)"
+            }
+            for aid in activity_ids
+        ]
+    }
+
+
+@responses.activate
+def test_recent_voyager_posts_paginates(mock_voyager_env_vars: None) -> None:
+    # 15 posts, one per hour: the first page is entirely within the window
+    now_ms = int(datetime.now().timestamp() * 1000)
+    ids = [str((now_ms - (h + 1) * 3600 * 1000) << 22) for h in range(15)]
+    responses.add(
+        responses.GET,
+        "https://www.linkedin.com/voyager/api/graphql",
+        json=_voyager_page_response(ids[:10]),
+    )
+    responses.add(
+        responses.GET,
+        "https://www.linkedin.com/voyager/api/graphql",
+        json=_voyager_page_response(ids[10:]),
+    )
+
+    posts = linkedin.recent_voyager_posts(max_age_in_hours=24)
+
+    assert [str(p.activity_id) for p in posts] == sorted(ids, key=int)
+    assert len(responses.calls) == 2
+    assert "start:10,count:10" in str(responses.calls[1].request.url)
+
+
+@responses.activate
+def test_recent_voyager_posts_stops_outside_window(mock_voyager_env_vars: None) -> None:
+    # A full page whose oldest post is outside the window: no further pages fetched
+    now_ms = int(datetime.now().timestamp() * 1000)
+    ids = [str((now_ms - (h + 1) * 3 * 3600 * 1000) << 22) for h in range(10)]
+    responses.add(
+        responses.GET,
+        "https://www.linkedin.com/voyager/api/graphql",
+        json=_voyager_page_response(ids),
+    )
+
+    posts = linkedin.recent_voyager_posts(max_age_in_hours=10)
+
+    assert [str(p.activity_id) for p in posts] == sorted(ids[:3], key=int)
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_recent_official_api_posts_paginates(mock_env_vars: None) -> None:
+    now_ms = int(datetime.now().timestamp() * 1000)
+    posts = [
+        {
+            "id": f"urn:li:share:{h}",
+            "createdAt": now_ms - (h + 1) * 3600 * 1000,
+            "distribution": {"feedDistribution": "MAIN_FEED"},
+        }
+        for h in range(25)
+    ]
+    base_url = "https://api.linkedin.com/rest/posts?author=urn%3Ali%3Aorganization%3A12345&q=author"
+    responses.add(
+        responses.GET, f"{base_url}&start=0&count=10&sortBy=CREATED", json={"elements": posts[:10]}
+    )
+    responses.add(
+        responses.GET,
+        f"{base_url}&start=10&count=10&sortBy=CREATED",
+        json={"elements": posts[10:20]},
+    )
+
+    recent = linkedin.recent_official_api_posts(15)
+
+    # The second page reaches past 15h, so the third page is never requested
+    assert len(responses.calls) == 2
+    assert [p.urn for p in recent] == [f"urn:li:share:{h}" for h in reversed(range(14))]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 50, 100_000])
+def test_stream_activity_ids(mock_voyager_response: Dict[str, Any], chunk_size: int) -> None:
+    body = json.dumps(mock_voyager_response).encode()
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    # URNs split across chunk boundaries are found, each ID once
+    test_ids = mock_voyager_response["_test_ids"]
+    assert list(linkedin.stream_activity_ids(chunks)) == [
+        test_ids["1h"],
+        test_ids["2d"],
+        test_ids["1w"],
+    ]
+
+
+def test_stream_activity_ids_ignores_other_urns() -> None:
+    body = (
+        b'{"included": [{"entityUrn": "urn:li:fsd_socialDetail:(urn:li:activity:1,2)"},'
+        b'{"*update": "urn:li:fsd_update:(urn:li:activity:42,COMPANY_FEED_ADMIN)"},'
+        b'{"entityUrn": "urn:li:fsd_update:(urn:li:activity:42,COMPANY_FEED_ADMIN)"}]}'
+    )
+    assert list(linkedin.stream_activity_ids([body])) == ["42"]
+
+
 def test_recent_post_urls_uses_voyager() -> None:
     # When Voyager returns posts, use them
-    with patch("linkedin.recent_voyager_posts", return_value=["111111", "222222"]):
+    voyager_posts = [posts.Post.from_activity_id(111111), posts.Post.from_activity_id(222222)]
+    with patch("linkedin.recent_voyager_posts", return_value=voyager_posts):
         with patch("linkedin.recent_official_api_posts") as mock_official:
             urls = linkedin.recent_post_urls(24)
 
@@ -254,7 +343,7 @@ def test_recent_post_urls_falls_back_to_official() -> None:
     with patch("linkedin.recent_voyager_posts", return_value=[]):
         with patch(
             "linkedin.recent_official_api_posts",
-            return_value=[{"id": "urn:li:share:333333"}],
+            return_value=[posts.Post.from_urn("urn:li:share:333333", posts.OFFICIAL_API)],
         ) as mock_official:
             urls = linkedin.recent_post_urls(48)
 
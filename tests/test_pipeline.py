@@ -0,0 +1,174 @@
+import asyncio
+import time
+from typing import Any, List
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+import pipeline
+import resilience
+from posts import OFFICIAL_API, Post
+
+SHARE_2 = Post.from_urn("urn:li:share:2", OFFICIAL_API)
+
+
+def test_fetch_prefers_voyager() -> None:
+    with patch("linkedin.recent_voyager_posts", return_value=[Post.from_activity_id(111111)]):
+        with patch("linkedin.recent_official_api_posts", return_value=[SHARE_2]):
+            with patch(
+                "slackc.slack_messages",
+                return_value=[{"text": "https://www.linkedin.com/feed/update/urn:li:share:2"}],
+            ) as mock_slack_get:
+                by_org, posted = pipeline.fetch(24, ["12345"], ["C1"])
+
+                assert by_org == {"12345": [Post.from_activity_id(111111)]}
+                assert posted == {"C1": {"urn:li:share:2"}}
+                mock_slack_get.assert_called_once_with(24, "C1")
+
+
+def test_fetch_without_slack_scan() -> None:
+    with patch("linkedin.recent_voyager_posts", return_value=[]):
+        with patch("linkedin.recent_official_api_posts", return_value=[SHARE_2]):
+            with patch("slackc.slack_messages") as mock_slack_get:
+                by_org, posted = pipeline.fetch(24, ["12345"], [])
+
+                assert by_org == {"12345": [SHARE_2]}
+                assert posted == {}
+                mock_slack_get.assert_not_called()
+
+
+def test_fetch_each_org_and_channel_once() -> None:
+    with patch(
+        "linkedin.recent_voyager_posts", return_value=[Post.from_activity_id(1)]
+    ) as mock_voyager:
+        with patch("linkedin.recent_official_api_posts", return_value=[]):
+            with patch("slackc.slack_messages", return_value=[]) as mock_slack_get:
+                by_org, posted = pipeline.fetch(24, ["A", "B"], ["C1", "C2", "C3"])
+
+                assert sorted(mock_voyager.call_args_list) == [call(24, "A"), call(24, "B")]
+                assert mock_slack_get.call_count == 3
+                assert set(by_org) == {"A", "B"}
+                assert set(posted) == {"C1", "C2", "C3"}
+
+
+def test_fetch_runs_sources_concurrently() -> None:
+    def slow_source(*args: Any) -> List[str]:
+        time.sleep(0.2)
+        return []
+
+    with patch("linkedin.recent_voyager_posts", side_effect=slow_source):
+        with patch("linkedin.recent_official_api_posts", side_effect=slow_source):
+            with patch("pipeline.posted_urns_in_channel", side_effect=slow_source):
+                start = time.monotonic()
+                pipeline.fetch(24, ["12345"], ["C1"])
+                # Roughly the slowest source, not the sum of all three
+                assert time.monotonic() - start < 0.5
+
+
+def test_fetch_bounds_parallelism() -> None:
+    def slow_source(*args: Any) -> List[str]:
+        time.sleep(0.1)
+        return []
+
+    with patch("linkedin.recent_voyager_posts", side_effect=slow_source):
+        with patch("linkedin.recent_official_api_posts", side_effect=slow_source):
+            start = time.monotonic()
+            asyncio.run(pipeline.fetch_async(24, ["A", "B"], [], max_workers=2))
+            # Four sources, two at a time
+            assert time.monotonic() - start >= 0.2
+
+
+def test_fetch_falls_back_when_voyager_fails() -> None:
+    with patch("linkedin.recent_voyager_posts", side_effect=Exception("Voyager API failed")):
+        with patch("linkedin.recent_official_api_posts", return_value=[SHARE_2]):
+            by_org, _ = pipeline.fetch(24, ["12345"], [])
+            assert by_org == {"12345": [SHARE_2]}
+
+
+def test_fetch_falls_back_when_voyager_times_out() -> None:
+    def slow_voyager(*args: Any) -> List[str]:
+        time.sleep(0.5)
+        return ["111111"]
+
+    with patch("linkedin.recent_voyager_posts", side_effect=slow_voyager):
+        with patch("linkedin.recent_official_api_posts", return_value=[SHARE_2]):
+            by_org, _ = asyncio.run(pipeline.fetch_async(24, ["12345"], [], voyager_timeout=0.1))
+            assert by_org == {"12345": [SHARE_2]}
+
+
+def test_fetch_raises_when_all_linkedin_sources_fail() -> None:
+    with patch("linkedin.recent_voyager_posts", side_effect=Exception("Voyager API failed")):
+        with patch("linkedin.recent_official_api_posts", side_effect=Exception("Official")):
+            with pytest.raises(Exception, match="Voyager API failed"):
+                pipeline.fetch(24, ["12345"], [])
+
+
+def test_fetch_raises_official_api_error_when_voyager_is_empty() -> None:
+    with patch("linkedin.recent_voyager_posts", return_value=[]):
+        with patch("linkedin.recent_official_api_posts", side_effect=Exception("Official")):
+            with pytest.raises(Exception, match="Official"):
+                pipeline.fetch(24, ["12345"], [])
+
+
+def test_fetch_raises_slack_error() -> None:
+    with patch("linkedin.recent_voyager_posts", return_value=[Post.from_activity_id(111111)]):
+        with patch("linkedin.recent_official_api_posts", return_value=[]):
+            with patch("slackc.slack_messages", side_effect=Exception("Slack failed")):
+                with pytest.raises(Exception, match="Slack failed"):
+                    pipeline.fetch(24, ["12345"], ["C1"])
+
+
+def test_fetch_opens_voyager_circuit_after_repeated_failures(
+    fresh_voyager_breaker: resilience.CircuitBreaker,
+) -> None:
+    with patch("linkedin.recent_voyager_posts", side_effect=Exception("401")) as mock_voyager:
+        with patch("linkedin.recent_official_api_posts", return_value=[SHARE_2]):
+            for _ in range(resilience.FAILURE_THRESHOLD + 2):
+                by_org, _ = pipeline.fetch(24, ["12345"], [])
+                assert by_org == {"12345": [SHARE_2]}
+
+            assert mock_voyager.call_count == resilience.FAILURE_THRESHOLD
+            assert not fresh_voyager_breaker.allow()
+
+
+def test_fetch_raises_official_api_error_when_voyager_circuit_is_open(
+    fresh_voyager_breaker: resilience.CircuitBreaker,
+) -> None:
+    for _ in range(resilience.FAILURE_THRESHOLD):
+        fresh_voyager_breaker.record_failure()
+
+    with patch("linkedin.recent_official_api_posts", side_effect=Exception("Official")):
+        with pytest.raises(Exception, match="Official"):
+            pipeline.fetch(24, ["12345"], [])
+
+
+def test_fetch_closes_voyager_circuit_on_success(
+    fresh_voyager_breaker: resilience.CircuitBreaker,
+) -> None:
+    fresh_voyager_breaker.record_failure()
+
+    with patch("linkedin.recent_voyager_posts", return_value=[Post.from_activity_id(111111)]):
+        with patch("linkedin.recent_official_api_posts", return_value=[]):
+            pipeline.fetch(24, ["12345"], [])
+
+    for _ in range(resilience.FAILURE_THRESHOLD - 1):
+        fresh_voyager_breaker.record_failure()
+    assert fresh_voyager_breaker.allow()
+
+
+def test_fetch_within_deadline() -> None:
+    with patch("pipeline.fetch_async", new=MagicMock(return_value=({}, {}))) as mock_fetch_async:
+        with patch("asyncio.run", side_effect=lambda result: result):
+            pipeline.fetch(24, ["12345"], ["C1"], resilience.Deadline(10))
+
+    kwargs = mock_fetch_async.call_args.kwargs
+    assert 4.9 < kwargs["voyager_timeout"] <= 10 * pipeline.FETCH_SHARE
+    assert 4.9 < kwargs["slack_timeout"] <= 10 * pipeline.FETCH_SHARE
+
+
+def test_fetch_fails_fast_after_deadline() -> None:
+    with patch("linkedin.recent_voyager_posts") as mock_voyager:
+        with pytest.raises(resilience.DeadlineExceeded):
+            pipeline.fetch(24, ["12345"], [], resilience.Deadline(0))
+
+        mock_voyager.assert_not_called()
@@ -0,0 +1,59 @@
+import dataclasses
+from datetime import datetime, timedelta
+
+import pytest
+
+import posts
+from posts import Post
+
+
+def test_from_activity_id() -> None:
+    post = Post.from_activity_id("7413922466504495104")
+
+    assert post.urn == "urn:li:activity:7413922466504495104"
+    assert post.activity_id == 7413922466504495104
+    assert post.created_at == 7413922466504495104 >> 22
+    assert post.source == posts.VOYAGER
+    assert post.url == "https://www.linkedin.com/feed/update/urn:li:activity:7413922466504495104"
+
+
+def test_from_official_api() -> None:
+    element = {
+        "id": "urn:li:share:7413922466504495104",
+        "createdAt": 1767616860000,
+        "distribution": {"feedDistribution": "NONE"},
+        "commentary": "Not kept",
+    }
+    post = Post.from_official_api(element)
+
+    assert post == Post(
+        "urn:li:share:7413922466504495104", None, 1767616860000, "official_api", "NONE"
+    )
+    assert not post.in_main_feed
+
+
+def test_in_main_feed() -> None:
+    assert Post("urn:li:share:1", None, 0, posts.OFFICIAL_API, "MAIN_FEED").in_main_feed
+    # Voyager and Slack don't report a feed distribution
+    assert Post.from_activity_id(1).in_main_feed
+
+
+def test_age_in_hours() -> None:
+    post_time = int((datetime.now() - timedelta(hours=5)).timestamp() * 1000)
+    post = Post("urn:li:share:1", None, post_time, posts.OFFICIAL_API)
+
+    # Allow some wiggle room for test execution time
+    assert 4.9 < post.age_in_hours() < 5.1
+    assert post.age_in_hours(now=post_time + 3600 * 1000) == 1
+
+
+def test_row_round_trip() -> None:
+    post = Post("urn:li:ugcPost:2", None, 1000, posts.OFFICIAL_API, "MAIN_FEED")
+    assert Post.from_row(post.to_row()) == post
+
+
+def test_post_is_immutable_and_slotted() -> None:
+    post = Post.from_activity_id(1)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        post.urn = "urn:li:activity:2"  # type: ignore[misc]
+    assert not hasattr(post, "__dict__")
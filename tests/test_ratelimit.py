@@ -0,0 +1,49 @@
+from typing import List
+
+import ratelimit
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_paces() -> None:
+    clock = FakeClock()
+    bucket = ratelimit.TokenBucket(rate=2, capacity=2, clock=clock.time, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    # Bucket empty: the third call waits for one token at 2 tokens per second
+    assert bucket.acquire() == 0.5
+    assert clock.now == 0.5
+
+
+def test_token_bucket_refills_up_to_capacity() -> None:
+    clock = FakeClock()
+    bucket = ratelimit.TokenBucket(rate=1, capacity=3, clock=clock.time, sleep=clock.sleep)
+    bucket.acquire()
+    assert bucket.remaining() == 2
+
+    clock.now += 100
+    assert bucket.remaining() == 3
+
+
+def test_token_bucket_pause() -> None:
+    clock = FakeClock()
+    bucket = ratelimit.TokenBucket(rate=1, capacity=3, clock=clock.time, sleep=clock.sleep)
+
+    bucket.pause(30)
+
+    assert bucket.remaining() == 0
+    assert bucket.acquire() == 31
+    # No burst right after the pause: tokens refill from the end of the pause
+    assert bucket.remaining() == 0
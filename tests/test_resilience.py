@@ -0,0 +1,85 @@
+import os
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+import resilience
+
+
+def test_deadline() -> None:
+    now = [100.0]
+    deadline = resilience.Deadline(10, clock=lambda: now[0])
+
+    assert deadline.remaining() == 10
+    assert deadline.budget(0.5, cap=30) == 5
+    assert deadline.budget(0.5, cap=2) == 2
+    deadline.check("fetching")
+
+    now[0] = 111
+    assert deadline.remaining() == 0
+    assert deadline.expired()
+    with pytest.raises(resilience.DeadlineExceeded, match="before posting"):
+        deadline.check("posting")
+
+
+def test_no_deadline() -> None:
+    deadline = resilience.Deadline()
+
+    assert not deadline.expired()
+    assert deadline.budget(0.5, cap=30) == 30
+
+
+def test_deadline_from_env() -> None:
+    with patch.dict(os.environ, {"SOMESY_DEADLINE_SECONDS": "20"}):
+        assert 19 < resilience.deadline_from_env().remaining() <= 20
+    with patch.dict(os.environ, {"SOMESY_DEADLINE_SECONDS": ""}):
+        assert not resilience.deadline_from_env().expired()
+
+
+def test_circuit_breaker_opens_and_retries_after_cooldown() -> None:
+    now: List[float] = [0.0]
+    breaker = resilience.CircuitBreaker(
+        failure_threshold=2, cooldown_seconds=60, clock=lambda: now[0]
+    )
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 60
+    assert breaker.allow()
+    # A failed trial reopens the circuit right away
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] = 120
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow()
+
+
+def test_circuit_breaker_persisted(tmp_path: Path) -> None:
+    path = str(tmp_path / "breaker.json")
+    breaker = resilience.CircuitBreaker(failure_threshold=1, path=path)
+    breaker.record_failure()
+    breaker.save()
+
+    assert not resilience.CircuitBreaker(failure_threshold=1, path=path).allow()
+
+
+def test_circuit_breaker_save_without_path() -> None:
+    resilience.CircuitBreaker().save()
+
+
+def test_voyager_breaker_from_env(tmp_path: Path) -> None:
+    path = str(tmp_path / "breaker.json")
+    with (
+        patch.object(resilience, "_voyager_breaker", None),
+        patch.dict(os.environ, {"SOMESY_BREAKER_FILE": path}),
+    ):
+        breaker = resilience.voyager_breaker()
+        assert breaker.path == path
+        assert resilience.voyager_breaker() is breaker
@@ -0,0 +1,34 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+import routing
+from routing import Route
+
+
+def test_parse_routes() -> None:
+    assert routing.parse_routes("12345=C111,C222; 67890=C111;") == [
+        Route("12345", "C111"),
+        Route("12345", "C222"),
+        Route("67890", "C111"),
+    ]
+
+
+def test_parse_routes_drops_duplicates() -> None:
+    assert routing.parse_routes("1=C1;1=C1,C1") == [Route("1", "C1")]
+
+
+@pytest.mark.parametrize("spec", ["12345", "=C111", "12345=", "12345=,"])
+def test_parse_routes_invalid(spec: str) -> None:
+    with pytest.raises(ValueError, match="Invalid route"):
+        routing.parse_routes(spec)
+
+
+def test_routes_from_env() -> None:
+    env = {"LINKEDIN_ORG_ID": "12345", "SLACK_CHANNEL_ID": "C111"}
+    with patch.dict(os.environ, env, clear=True):
+        assert routing.routes_from_env() == [Route("12345", "C111")]
+
+    with patch.dict(os.environ, {**env, "SOMESY_ROUTES": "1=C1,C2"}, clear=True):
+        assert routing.routes_from_env() == [Route("1", "C1"), Route("1", "C2")]
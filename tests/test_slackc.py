@@ -1,13 +1,20 @@
 import os
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
 
+import ratelimit
+import resilience
 import slackc
+import slackweb
+from posts import Post
 
 
-from typing import Any, Dict, Generator
+from typing import Any, Dict, Generator, List
 
 
 @pytest.fixture
@@ -33,6 +40,28 @@ def test_slack_client() -> None:
         assert isinstance(client, WebClient)
         assert client.token == "test-token"
 
+        # The client is reused, so keep-alive connections survive between calls
+        assert slackc.slack_client() is client
+
+    with patch.dict(os.environ, {"SLACK_TOKEN": "rotated-token"}):
+        assert slackc.slack_client().token == "rotated-token"
+
+
+def test_slack_client_minimal_transport() -> None:
+    with patch.dict(os.environ, {"SLACK_TOKEN": "test-token", "SOMESY_SLACK_TRANSPORT": "minimal"}):
+        client = slackc.slack_client()
+        assert isinstance(client, slackweb.WebClient)
+        assert client.token == "test-token"
+        assert slackc.slack_client() is client
+
+    with patch.dict(os.environ, {"SLACK_TOKEN": "test-token"}):
+        assert isinstance(slackc.slack_client(), WebClient)
+
+
+def test_api_errors_before_slack_sdk_is_loaded() -> None:
+    with patch.dict("sys.modules", {"slack_sdk.errors": None}):
+        assert slackc._api_errors() == (slackweb.SlackApiError,)
+
 
 @pytest.fixture
 def mock_slack_response() -> Dict[str, Any]:
@@ -55,14 +84,85 @@ def test_slack_messages(mock_env_vars: None) -> None:
             "messages": [{"text": "Message 1"}, {"text": "Message 2"}],
         }
 
-        messages = slackc.slack_messages()
+        messages = list(slackc.slack_messages())
 
         # Verify correct parameters
-        mock_instance.conversations_history.assert_called_once_with(channel="C12345678")
+        mock_instance.conversations_history.assert_called_once_with(
+            channel="C12345678", limit=slackc.HISTORY_PAGE_SIZE, include_all_metadata=True
+        )
         assert len(messages) == 2
         assert messages[0]["text"] == "Message 1"
 
 
+def test_slack_messages_follows_cursor(mock_env_vars: None) -> None:
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+
+        mock_instance.conversations_history.side_effect = [
+            {
+                "ok": True,
+                "messages": [{"text": "https://www.linkedin.com/feed/update/urn:li:activity:2"}],
+                "response_metadata": {"next_cursor": "page-2"},
+            },
+            {
+                "ok": True,
+                "messages": [{"text": "https://www.linkedin.com/feed/update/urn:li:activity:1"}],
+                "response_metadata": {"next_cursor": ""},
+            },
+        ]
+
+        messages = list(slackc.slack_messages())
+
+        assert [m["text"][-1] for m in messages] == ["2", "1"]
+        assert mock_instance.conversations_history.call_count == 2
+        second_call = mock_instance.conversations_history.call_args_list[1]
+        assert second_call.kwargs["cursor"] == "page-2"
+
+
+def test_slack_messages_stops_past_window(mock_env_vars: None) -> None:
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+
+        now = time.time()
+        mock_instance.conversations_history.return_value = {
+            "ok": True,
+            "messages": [
+                {"text": "recent", "ts": f"{now - 3600:.6f}"},
+                {"text": "too old", "ts": f"{now - 48 * 3600:.6f}"},
+                {"text": "older still", "ts": f"{now - 72 * 3600:.6f}"},
+            ],
+            "response_metadata": {"next_cursor": "more"},
+        }
+
+        messages = list(slackc.slack_messages(24))
+
+        # Stops at the first message outside the window and doesn't fetch the next page
+        assert [m["text"] for m in messages] == ["recent"]
+        mock_instance.conversations_history.assert_called_once()
+        oldest = float(mock_instance.conversations_history.call_args.kwargs["oldest"])
+        expected = now - (24 + slackc.HISTORY_MARGIN_IN_HOURS) * 3600
+        assert abs(oldest - expected) < 60
+
+
+def test_slack_messages_time_range(mock_env_vars: None) -> None:
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        mock_instance.conversations_history.return_value = {"ok": True, "messages": []}
+
+        list(slackc.slack_messages(channel_id="C1", oldest=1000.5, latest=2000))
+
+        mock_instance.conversations_history.assert_called_once_with(
+            channel="C1",
+            limit=slackc.HISTORY_PAGE_SIZE,
+            include_all_metadata=True,
+            oldest="1000.500000",
+            latest="2000.000000",
+        )
+
+
 def test_post_slack_message(mock_env_vars: None) -> None:
     with patch.object(slackc, "slack_client") as mock_client:
         mock_instance = MagicMock()
@@ -72,5 +172,228 @@ def test_post_slack_message(mock_env_vars: None) -> None:
 
         # Verify correct parameters
         mock_instance.chat_postMessage.assert_called_once_with(
-            channel="C12345678", text="Test message"
+            channel="C12345678", text="Test message", metadata=None
+        )
+
+
+def test_post_slack_message_tags_linkedin_post(mock_env_vars: None) -> None:
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+
+        slackc.post_slack_message(
+            "https://www.linkedin.com/feed/update/urn:li:activity:7380000000000000000"
         )
+
+        metadata = mock_instance.chat_postMessage.call_args.kwargs["metadata"]
+        assert metadata == {
+            "event_type": slackc.METADATA_EVENT_TYPE,
+            "event_payload": {
+                "urn": "urn:li:activity:7380000000000000000",
+                "created_at": 7380000000000000000 >> 22,
+            },
+        }
+
+
+def test_posted_urns_prefers_metadata() -> None:
+    edited = {
+        "text": "Edited, link removed",
+        "metadata": {
+            "event_type": slackc.METADATA_EVENT_TYPE,
+            "event_payload": {"urn": "urn:li:activity:1", "created_at": 0},
+        },
+    }
+    other_app = {
+        "text": "https://www.linkedin.com/feed/update/urn:li:share:2",
+        "metadata": {"event_type": "deployment_started", "event_payload": {}},
+    }
+    empty_payload = {
+        "text": "https://www.linkedin.com/feed/update/urn:li:share:3",
+        "metadata": {"event_type": slackc.METADATA_EVENT_TYPE, "event_payload": {}},
+    }
+
+    assert slackc.posted_urns([edited, other_app, empty_payload]) == {
+        "urn:li:activity:1",
+        "urn:li:share:2",
+        "urn:li:share:3",
+    }
+
+
+def test_message_posts() -> None:
+    tagged = {
+        "text": "https://www.linkedin.com/feed/update/urn:li:activity:7413922466504495104",
+        "metadata": {
+            "event_type": slackc.METADATA_EVENT_TYPE,
+            "event_payload": {"urn": "urn:li:activity:7413922466504495104", "created_at": 42},
+        },
+    }
+    legacy = {"text": "https://www.linkedin.com/feed/update/urn:li:share:7413922466504495104"}
+
+    # The creation time comes from the metadata, or else from the Snowflake ID
+    assert slackc.message_posts(tagged) == [
+        Post("urn:li:activity:7413922466504495104", 7413922466504495104, 42, "slack")
+    ]
+    assert slackc.message_posts(legacy) == [
+        Post("urn:li:share:7413922466504495104", None, 7413922466504495104 >> 22, "slack")
+    ]
+
+
+def test_urns_in_text() -> None:
+    assert slackc.urns_in_text("https://www.linkedin.com/feed/update/urn:li:ugcPost:42") == [
+        "urn:li:ugcPost:42"
+    ]
+    assert slackc.urns_in_text("https://www.linkedin.com/feed/update/urn%3Ali%3Ashare%3A7") == [
+        "urn:li:share:7"
+    ]
+    assert slackc.urns_in_text("Just a regular message") == []
+
+
+def test_posted_urns() -> None:
+    messages = [
+        {"text": "https://www.linkedin.com/feed/update/urn:li:activity:1"},
+        {"text": "<https://www.linkedin.com/feed/update/urn:li:share:2/|post>"},
+        {"text": "Just a regular message"},
+        {"type": "channel_join"},
+    ]
+    assert slackc.posted_urns(messages) == {"urn:li:activity:1", "urn:li:share:2"}
+
+
+def _slack_error(status_code: int, error: str, headers: Dict[str, str]) -> SlackApiError:
+    response = SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/chat.postMessage",
+        req_args={},
+        data={"ok": False, "error": error},
+        headers=headers,
+        status_code=status_code,
+    )
+    return SlackApiError(error, response)
+
+
+@pytest.fixture
+def fake_sleeps() -> Generator[List[float], None, None]:
+    # Post pacing on a fake clock that advances when sleeping
+    sleeps: List[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    bucket = ratelimit.TokenBucket(
+        slackc.POST_RATE_PER_SECOND, slackc.POST_BURST, clock=lambda: sum(sleeps), sleep=sleep
+    )
+    with patch.object(slackc, "_post_bucket", return_value=bucket):
+        yield sleeps
+
+
+def test_post_slack_message_honours_retry_after(
+    mock_env_vars: None, fake_sleeps: List[float]
+) -> None:
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        mock_instance.chat_postMessage.side_effect = [
+            _slack_error(429, "ratelimited", {"Retry-After": "7"}),
+            {"ok": True},
+        ]
+
+        slackc.post_slack_message("Test message")
+
+        assert mock_instance.chat_postMessage.call_count == 2
+        assert sum(fake_sleeps) >= 7
+
+
+def test_post_slack_message_retries_minimal_client_errors(
+    mock_env_vars: None, fake_sleeps: List[float]
+) -> None:
+    response = slackweb.SlackResponse({"ok": False, "error": "ratelimited"}, 429, {})
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        mock_instance.chat_postMessage.side_effect = [
+            slackweb.SlackApiError("ratelimited", response),
+            {"ok": True},
+        ]
+
+        slackc.post_slack_message("Test message")
+
+        assert mock_instance.chat_postMessage.call_count == 2
+        assert sum(fake_sleeps) >= 1
+
+
+def test_post_slack_message_gives_up_after_retries(
+    mock_env_vars: None, fake_sleeps: List[float]
+) -> None:
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        mock_instance.chat_postMessage.side_effect = _slack_error(
+            429, "ratelimited", {"retry-after": "1"}
+        )
+
+        with pytest.raises(SlackApiError):
+            slackc.post_slack_message("Test message")
+
+        assert mock_instance.chat_postMessage.call_count == slackc.MAX_RATE_LIMIT_RETRIES + 1
+
+
+def test_post_slack_message_does_not_retry_other_errors(mock_env_vars: None) -> None:
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+        mock_instance.chat_postMessage.side_effect = _slack_error(200, "channel_not_found", {})
+
+        with pytest.raises(SlackApiError):
+            slackc.post_slack_message("Test message")
+
+        mock_instance.chat_postMessage.assert_called_once()
+
+
+def test_post_slack_messages_in_order(mock_env_vars: None, fake_sleeps: List[float]) -> None:
+    with patch.object(slackc, "slack_client") as mock_client:
+        mock_instance = MagicMock()
+        mock_client.return_value = mock_instance
+
+        outcomes = slackc.post_slack_messages(["1", "2", "3", "4", "5"])
+
+        assert [o.status for o in outcomes] == [slackc.POSTED] * 5
+        posted = [c.kwargs["text"] for c in mock_instance.chat_postMessage.call_args_list]
+        assert posted == ["1", "2", "3", "4", "5"]
+        # The first POST_BURST messages go out at once, the rest are paced
+        assert len(fake_sleeps) == 5 - slackc.POST_BURST
+
+
+def test_post_slack_messages_skips_after_failure(mock_env_vars: None) -> None:
+    with patch.object(slackc, "post_slack_message") as mock_post:
+        mock_post.side_effect = [None, Exception("boom"), None]
+
+        outcomes = slackc.post_slack_messages(["1", "2", "3"])
+
+        assert [(o.message, o.status) for o in outcomes] == [
+            ("1", slackc.POSTED),
+            ("2", slackc.FAILED),
+            ("3", slackc.SKIPPED),
+        ]
+        assert outcomes[1].error == "boom"
+        assert mock_post.call_count == 2
+
+
+def test_posted_urns_skips_activity_ids_below_bound() -> None:
+    messages = [
+        {"text": "https://www.linkedin.com/feed/update/urn:li:activity:100"},
+        {"text": "https://www.linkedin.com/feed/update/urn:li:activity:200"},
+        {"text": "https://www.linkedin.com/feed/update/urn:li:share:1"},
+    ]
+    assert slackc.posted_urns(messages, min_activity_id=150) == {
+        "urn:li:activity:200",
+        "urn:li:share:1",
+    }
+
+
+def test_post_slack_messages_stops_at_deadline(mock_env_vars: None) -> None:
+    with patch.object(slackc, "post_slack_message") as mock_post:
+        outcomes = slackc.post_slack_messages(["1", "2"], deadline=resilience.Deadline(0))
+
+        assert [o.status for o in outcomes] == [slackc.FAILED, slackc.SKIPPED]
+        assert outcomes[0].error == "Deadline exceeded before posting"
+        mock_post.assert_not_called()
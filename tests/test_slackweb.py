@@ -0,0 +1,75 @@
+import pytest
+import responses
+from responses import matchers
+
+import slackweb
+
+
+@responses.activate
+def test_api_call_posts_form_with_token() -> None:
+    responses.add(
+        responses.POST,
+        "https://slack.com/api/conversations.history",
+        json={"ok": True, "messages": []},
+        match=[
+            matchers.header_matcher({"Authorization": "Bearer xoxb-token"}),
+            matchers.urlencoded_params_matcher(
+                {"channel": "C1", "limit": "200", "include_all_metadata": "true"}
+            ),
+        ],
+    )
+
+    response = slackweb.WebClient("xoxb-token").conversations_history(
+        channel="C1", limit=200, cursor=None, include_all_metadata=True
+    )
+
+    assert response["messages"] == []
+    assert response.status_code == 200
+
+
+@responses.activate
+def test_api_call_encodes_objects_as_json() -> None:
+    responses.add(
+        responses.POST,
+        "https://slack.com/api/chat.postMessage",
+        json={"ok": True},
+        match=[
+            matchers.urlencoded_params_matcher(
+                {"channel": "C1", "metadata": '{"event_type": "e", "event_payload": {}}'}
+            )
+        ],
+    )
+
+    slackweb.WebClient("xoxb-token").chat_postMessage(
+        channel="C1", metadata={"event_type": "e", "event_payload": {}}
+    )
+
+
+@responses.activate
+def test_api_call_raises_on_error() -> None:
+    responses.add(
+        responses.POST,
+        "https://slack.com/api/chat.postMessage",
+        json={"ok": False, "error": "ratelimited"},
+        status=429,
+        headers={"Retry-After": "7"},
+    )
+
+    with pytest.raises(slackweb.SlackApiError) as e:
+        slackweb.WebClient("xoxb-token").chat_postMessage(channel="C1", text="hi")
+
+    assert e.value.response.status_code == 429
+    assert e.value.response["error"] == "ratelimited"
+    assert e.value.response.headers["Retry-After"] == "7"
+
+
+@responses.activate
+def test_api_call_handles_non_json_response() -> None:
+    responses.add(
+        responses.POST, "https://slack.com/api/chat.postMessage", body="Bad Gateway", status=502
+    )
+
+    with pytest.raises(slackweb.SlackApiError) as e:
+        slackweb.WebClient("xoxb-token").chat_postMessage(channel="C1", text="hi")
+
+    assert e.value.response["error"] == "http_502"
@@ -0,0 +1,34 @@
+import snowflake
+
+
+def test_timestamp_ms() -> None:
+    # Activity ID 7413922466504495104 was posted around Dec 31, 2025
+    assert snowflake.timestamp_ms("7413922466504495104") == 1767616860033
+    assert snowflake.timestamp_ms(7413922466504495104) == 1767616860033
+
+
+def test_min_activity_id_is_inverse_of_timestamp() -> None:
+    cutoff_ms = 1767616860033
+    min_id = snowflake.min_activity_id(cutoff_ms)
+
+    assert snowflake.timestamp_ms(min_id) == cutoff_ms
+    assert snowflake.timestamp_ms(min_id - 1) == cutoff_ms - 1
+    # Any ID created in the same millisecond is at or above the bound
+    assert 7413922466504495104 >= snowflake.min_activity_id(1767616860033)
+    assert 7413922466504495104 < snowflake.min_activity_id(1767616860034)
+
+
+def test_min_activity_id_for_age() -> None:
+    now = 1767616860033
+    min_id = snowflake.min_activity_id_for_age(2, now)
+
+    assert snowflake.timestamp_ms(min_id) == now - 2 * 3600 * 1000
+    assert snowflake.age_in_hours(min_id, now) == 2
+
+
+def test_ages_in_hours_uses_one_now() -> None:
+    now = 1767616860033
+    ids = [snowflake.min_activity_id(now - h * 3600 * 1000) for h in (1, 5, 24)]
+
+    assert snowflake.ages_in_hours(ids, now) == [1, 5, 24]
+    assert all(age >= 24 for age in snowflake.ages_in_hours(ids[2:]))
@@ -0,0 +1,74 @@
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import state
+
+
+def test_activity_id_from_urn() -> None:
+    assert state.activity_id_from_urn("urn:li:activity:123") == 123
+    assert state.activity_id_from_urn("urn:li:share:123") is None
+
+
+def test_record_advances_watermark() -> None:
+    store = state.StateStore()
+    store.record("C1", ["urn:li:activity:100", "urn:li:share:7"])
+    store.record("C1", ["urn:li:activity:50"])
+
+    assert store.watermark("C1") == 100
+    assert store.watermark("C2") == 0
+    # Activity URNs covered by the watermark are pruned, other URNs are kept
+    assert store.posted_urns("C1") == {"urn:li:share:7"}
+
+
+def test_is_known() -> None:
+    store = state.StateStore()
+    store.record("C1", ["urn:li:activity:100", "urn:li:share:7"])
+
+    assert store.is_known("C1", ["urn:li:activity:99"])
+    assert store.is_known("C1", ["urn:li:activity:100"])
+    assert store.is_known("C1", ["urn:li:share:7"])
+    assert not store.is_known("C1", ["urn:li:activity:101"])
+    assert not store.is_known("C1", ["urn:li:share:8"])
+    assert not store.is_known("C2", ["urn:li:activity:99"])
+
+
+def test_reconciliation_due() -> None:
+    store = state.StateStore(reconcile_interval_in_hours=1)
+    assert store.reconciliation_due("C1")
+
+    store.mark_reconciled("C1", ["urn:li:activity:100"])
+    assert not store.reconciliation_due("C1")
+    assert store.watermark("C1") == 100
+
+    with patch("state.time.time", return_value=time.time() + 2 * 3600):
+        assert store.reconciliation_due("C1")
+
+
+def test_json_state_store_round_trip(tmp_path: Path) -> None:
+    path = str(tmp_path / "state.json")
+    store = state.JsonStateStore(path)
+    store.mark_reconciled("C1", ["urn:li:activity:100", "urn:li:ugcPost:5"])
+    store.save()
+
+    loaded = state.JsonStateStore(path)
+    assert loaded.watermark("C1") == 100
+    assert loaded.posted_urns("C1") == {"urn:li:ugcPost:5"}
+    assert not loaded.reconciliation_due("C1")
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_state_store_from_env(tmp_path: Path) -> None:
+    with patch.dict(os.environ, {}, clear=True):
+        assert state.state_store_from_env() is None
+        in_memory = state.state_store_from_env(in_memory=True)
+        assert type(in_memory) is state.StateStore
+
+    path = str(tmp_path / "state.json")
+    env = {"SOMESY_STATE_FILE": path, "SOMESY_RECONCILE_INTERVAL_HOURS": "6"}
+    with patch.dict(os.environ, env):
+        store = state.state_store_from_env()
+        assert isinstance(store, state.JsonStateStore)
+        assert store.path == path
+        assert store.reconcile_interval_in_hours == 6
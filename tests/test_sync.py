@@ -1,64 +1,237 @@
-from unittest.mock import patch
+import os
+from typing import Dict, Generator, List
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+import posts
+import snowflake
+import state
 import sync
+from routing import Route
 
-from typing import Dict, List
+# Realistic activity IDs created 3, 2 and 1 hours ago
+ID_1, ID_2, ID_3 = (
+    str(snowflake.min_activity_id(snowflake.now_ms() - hours * 3600 * 1000)) for hours in (3, 2, 1)
+)
+
+
+def post_url(activity_id: str) -> str:
+    return f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"
+
+
+def voyager(*activity_ids: str) -> List[posts.Post]:
+    return [posts.Post.from_activity_id(aid) for aid in activity_ids]
+
+
+@pytest.fixture(autouse=True)
+def mock_env_vars() -> Generator[None, None, None]:
+    with patch.dict(os.environ, {"LINKEDIN_ORG_ID": "12345", "SLACK_CHANNEL_ID": "C1"}):
+        os.environ.pop("SOMESY_ROUTES", None)
+        yield
 
 
 @pytest.fixture
 def mock_slack_messages() -> List[Dict[str, str]]:
     return [
-        {"text": "https://www.linkedin.com/feed/update/urn:li:activity:111111"},
+        {"text": post_url(ID_1)},
         {"text": "Just a regular message"},
     ]
 
 
-def test_linkedin_to_slack_posts_new(mock_slack_messages: List[Dict[str, str]]) -> None:
+@pytest.fixture
+def mock_official_api() -> Generator[MagicMock, None, None]:
+    # Only used when Voyager returns no posts
+    with patch("linkedin.recent_official_api_posts", return_value=[]) as mock_official:
+        yield mock_official
+
+
+def test_linkedin_to_slack_posts_new(
+    mock_slack_messages: List[Dict[str, str]], mock_official_api: MagicMock
+) -> None:
     # Test posting new URLs that aren't in Slack yet
-    with patch(
-        "sync.linkedin.recent_post_urls",
-        return_value=[
-            "https://www.linkedin.com/feed/update/urn:li:activity:111111",
-            "https://www.linkedin.com/feed/update/urn:li:activity:222222",
-        ],
-    ) as mock_linkedin:
+    with patch("linkedin.recent_voyager_posts", return_value=voyager(ID_1, ID_2)) as mock_voyager:
         with patch(
             "sync.slackc.slack_messages", return_value=mock_slack_messages
         ) as mock_slack_get:
             with patch("sync.slackc.post_slack_message") as mock_slack_post:
                 sync.linkedin_to_slack(24)
 
-                mock_linkedin.assert_called_once_with(24)
-                mock_slack_get.assert_called_once()
+                mock_voyager.assert_called_once_with(24, "12345")
+                mock_slack_get.assert_called_once_with(24, "C1")
 
-                # Should only post 222222, since 111111 is already in Slack
+                # Should only post ID_2, since ID_1 is already in Slack
                 assert mock_slack_post.call_count == 1
-                mock_slack_post.assert_called_once_with(
-                    "https://www.linkedin.com/feed/update/urn:li:activity:222222"
-                )
+                mock_slack_post.assert_called_once_with(post_url(ID_2), "C1")
 
 
-def test_linkedin_to_slack_no_new_posts() -> None:
+def test_linkedin_to_slack_no_new_posts(mock_official_api: MagicMock) -> None:
     # All posts already in Slack
-    with patch(
-        "sync.linkedin.recent_post_urls",
-        return_value=["https://www.linkedin.com/feed/update/urn:li:activity:111111"],
-    ):
+    with patch("linkedin.recent_voyager_posts", return_value=voyager(ID_1)):
         with patch(
             "sync.slackc.slack_messages",
-            return_value=[{"text": "https://www.linkedin.com/feed/update/urn:li:activity:111111"}],
+            return_value=[{"text": post_url(ID_1)}],
         ):
             with patch("sync.slackc.post_slack_message") as mock_slack_post:
                 sync.linkedin_to_slack(24)
                 mock_slack_post.assert_not_called()
 
 
-def test_linkedin_to_slack_no_posts() -> None:
+def test_linkedin_to_slack_no_posts(mock_official_api: MagicMock) -> None:
     # No LinkedIn posts at all
-    with patch("sync.linkedin.recent_post_urls", return_value=[]):
+    with patch("linkedin.recent_voyager_posts", return_value=[]):
         with patch("sync.slackc.slack_messages", return_value=[]):
             with patch("sync.slackc.post_slack_message") as mock_slack_post:
                 sync.linkedin_to_slack(24)
                 mock_slack_post.assert_not_called()
+
+
+def test_linkedin_to_slack_falls_back_to_official_api() -> None:
+    with patch("linkedin.recent_voyager_posts", return_value=[]):
+        with patch(
+            "linkedin.recent_official_api_posts",
+            return_value=[posts.Post.from_urn("urn:li:share:333333", posts.OFFICIAL_API)],
+        ):
+            with patch("sync.slackc.slack_messages", return_value=[]):
+                with patch("sync.slackc.post_slack_message") as mock_slack_post:
+                    sync.linkedin_to_slack(48)
+                    mock_slack_post.assert_called_once_with(
+                        "https://www.linkedin.com/feed/update/urn:li:share:333333", "C1"
+                    )
+
+
+def test_linkedin_to_slack_matches_urn_regardless_of_url_format(
+    mock_official_api: MagicMock,
+) -> None:
+    # Slack wraps links and may keep them percent-encoded; dedup is by URN, not by URL text
+    with patch("linkedin.recent_voyager_posts", return_value=voyager(ID_1, ID_2, ID_3)):
+        with patch(
+            "sync.slackc.slack_messages",
+            return_value=[
+                {"text": f"<{post_url(ID_1)}/|New post>"},
+                {"text": f"https://www.linkedin.com/feed/update/urn%3Ali%3Aactivity%3A{ID_2}"},
+            ],
+        ):
+            with patch("sync.slackc.post_slack_message") as mock_slack_post:
+                sync.linkedin_to_slack(24)
+                mock_slack_post.assert_called_once_with(post_url(ID_3), "C1")
+
+
+def test_linkedin_to_slack_skips_slack_for_known_posts(mock_official_api: MagicMock) -> None:
+    store = state.StateStore()
+    store.mark_reconciled("C1", [f"urn:li:activity:{ID_2}"])
+
+    with patch("linkedin.recent_voyager_posts", return_value=voyager(ID_1, ID_2)):
+        with patch("sync.slackc.slack_messages") as mock_slack_get:
+            with patch("sync.slackc.post_slack_message") as mock_slack_post:
+                sync.linkedin_to_slack(24, store=store)
+
+                # Both posts are at or below the watermark: no Slack calls at all
+                mock_slack_get.assert_not_called()
+                mock_slack_post.assert_not_called()
+
+
+def test_linkedin_to_slack_reconciles_on_cache_miss(mock_official_api: MagicMock) -> None:
+    store = state.StateStore()
+    store.mark_reconciled("C1", [f"urn:li:activity:{ID_1}"])
+
+    with patch("linkedin.recent_voyager_posts", return_value=voyager(ID_1, ID_2, ID_3)):
+        with patch(
+            "sync.slackc.slack_messages",
+            return_value=[{"text": post_url(ID_2)}],
+        ) as mock_slack_get:
+            with patch("sync.slackc.post_slack_message") as mock_slack_post:
+                sync.linkedin_to_slack(24, store=store)
+
+                mock_slack_get.assert_called_once_with(24, "C1")
+                mock_slack_post.assert_called_once_with(post_url(ID_3), "C1")
+    assert store.watermark("C1") == int(ID_3)
+
+
+def test_linkedin_to_slack_reconciles_when_due(mock_official_api: MagicMock) -> None:
+    store = state.StateStore()
+
+    with patch("linkedin.recent_voyager_posts", return_value=[]):
+        with patch(
+            "sync.slackc.slack_messages",
+            return_value=[{"text": post_url(ID_2)}],
+        ) as mock_slack_get:
+            sync.linkedin_to_slack(24, store=store)
+
+            # The Slack history is scanned even without candidates and recorded
+            mock_slack_get.assert_called_once_with(24, "C1")
+    assert not store.reconciliation_due("C1")
+    assert store.watermark("C1") == int(ID_2)
+
+
+def test_linkedin_to_slack_records_partial_failure(mock_official_api: MagicMock) -> None:
+    store = state.StateStore()
+
+    with patch("linkedin.recent_voyager_posts", return_value=voyager(ID_1, ID_2, ID_3)):
+        with patch("sync.slackc.slack_messages", return_value=[]):
+            with patch("sync.slackc.post_slack_message") as mock_slack_post:
+                mock_slack_post.side_effect = [None, Exception("boom"), None]
+
+                with pytest.raises(Exception, match="C1 failed, 2 of 3 posts not synced: boom"):
+                    sync.linkedin_to_slack(24, store=store)
+
+    # Only the post that made it is recorded, so a rerun resumes from ID_2
+    assert store.watermark("C1") == int(ID_1)
+    assert not store.is_known("C1", [f"urn:li:activity:{ID_2}"])
+
+
+def test_linkedin_to_slack_dedups_across_urn_forms() -> None:
+    # Slack has the post from the official API; Voyager returns the same post as an activity
+    with patch("linkedin.recent_voyager_posts", return_value=voyager(ID_1, ID_2)):
+        with patch("linkedin.recent_official_api_posts", return_value=[]):
+            with patch(
+                "sync.slackc.slack_messages",
+                return_value=[{"text": "https://www.linkedin.com/feed/update/urn:li:share:10"}],
+            ):
+                with patch(
+                    "urns.resolve", return_value={f"urn:li:activity:{ID_1}": "urn:li:share:10"}
+                ) as mock_resolve:
+                    with patch("sync.slackc.post_slack_message") as mock_slack_post:
+                        sync.linkedin_to_slack(24)
+
+                        mock_resolve.assert_called_once()
+                        mock_slack_post.assert_called_once_with(post_url(ID_2), "C1")
+
+
+def test_linkedin_to_slack_fans_out_routes(mock_official_api: MagicMock) -> None:
+    # Org A feeds C1 and C2, org B feeds C2 as well
+    routes = [Route("A", "C1"), Route("A", "C2"), Route("B", "C2")]
+    voyager_posts = {"A": voyager(ID_1, ID_3), "B": voyager(ID_2)}
+
+    with patch(
+        "linkedin.recent_voyager_posts", side_effect=lambda age, org_id: voyager_posts[org_id]
+    ) as mock_voyager:
+        with patch(
+            "sync.slackc.slack_messages",
+            side_effect=lambda age, channel_id: (
+                [{"text": post_url(ID_1)}] if channel_id == "C2" else []
+            ),
+        ) as mock_slack_get:
+            with patch("sync.slackc.post_slack_message") as mock_slack_post:
+                sync.linkedin_to_slack(24, routes=routes)
+
+                # Each org fetched once, each channel scanned once
+                assert mock_voyager.call_count == 2
+                assert mock_slack_get.call_count == 2
+
+                posted: Dict[str, List[str]] = {"C1": [], "C2": []}
+                for c in mock_slack_post.call_args_list:
+                    posted[c.args[1]].append(c.args[0])
+                assert posted["C1"] == [post_url(ID_1), post_url(ID_3)]
+                # Posts of both orgs merged oldest first, without the one already in C2
+                assert posted["C2"] == [post_url(ID_2), post_url(ID_3)]
+
+
+def test_linkedin_to_slack_reports_failed_channels(mock_official_api: MagicMock) -> None:
+    routes = [Route("A", "C1"), Route("A", "C2")]
+
+    with patch("linkedin.recent_voyager_posts", return_value=voyager(ID_1)):
+        with patch("sync.slackc.slack_messages", return_value=[]):
+            with patch("sync.slackc.post_slack_message", side_effect=Exception("boom")):
+                with pytest.raises(Exception, match="Sync failed for 2 channels"):
+                    sync.linkedin_to_slack(24, routes=routes)
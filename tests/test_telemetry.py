@@ -0,0 +1,117 @@
+import json
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+import responses
+from slack_sdk.errors import SlackApiError
+
+import httpclient
+import slackc
+import telemetry
+
+
+@pytest.fixture
+def records() -> Iterator[List[Dict[str, Any]]]:
+    collected: List[Dict[str, Any]] = []
+    previous = telemetry.set_sink(collected.append)
+    telemetry.reset_counters()
+    yield collected
+    telemetry.set_sink(previous)
+
+
+@pytest.fixture
+def disabled() -> Iterator[None]:
+    previous = telemetry.set_sink(None)
+    yield
+    telemetry.set_sink(previous)
+
+
+def test_stdout_sink_writes_json_lines(capsys: pytest.CaptureFixture[str]) -> None:
+    telemetry.stdout_sink({"severity": "INFO", "message": "hello"})
+
+    assert json.loads(capsys.readouterr().out) == {"severity": "INFO", "message": "hello"}
+
+
+@pytest.mark.parametrize("value,enabled", [("off", False), ("0", False), ("on", True)])
+def test_sink_from_env(value: str, enabled: bool) -> None:
+    with patch.dict("os.environ", {"SOMESY_TELEMETRY": value}):
+        assert (telemetry._sink_from_env() is not None) == enabled
+
+
+def test_span_logs_duration_and_fields(records: List[Dict[str, Any]]) -> None:
+    with telemetry.span("voyager", org_id="12345") as span:
+        span.set(pages=2)
+
+    assert records[0]["message"] == "voyager done"
+    assert records[0]["severity"] == "INFO"
+    assert records[0]["org_id"] == "12345"
+    assert records[0]["pages"] == 2
+    assert records[0]["duration_ms"] >= 0
+
+
+def test_span_logs_errors(records: List[Dict[str, Any]]) -> None:
+    with pytest.raises(ValueError), telemetry.span("post"):
+        raise ValueError("boom")
+
+    assert records[0]["message"] == "post failed"
+    assert records[0]["severity"] == "ERROR"
+    assert records[0]["error"] == "ValueError('boom')"
+
+
+def test_counters_are_logged_and_reset(records: List[Dict[str, Any]]) -> None:
+    telemetry.count("slack.posts")
+    telemetry.count("slack.posts", 2)
+
+    telemetry.log_counters("Sync counters")
+
+    assert records == [
+        {"severity": "INFO", "message": "Sync counters", "counters": {"slack.posts": 3}}
+    ]
+    assert telemetry.counters() == {}
+
+
+def test_disabled_emits_nothing(disabled: None, capsys: pytest.CaptureFixture[str]) -> None:
+    telemetry.log("hello")
+    telemetry.log_http("GET", "https://example.com", 200, 0.1)
+    telemetry.count("slack.posts")
+    telemetry.log_counters("Sync counters")
+    with telemetry.span("voyager") as span:
+        span.set(pages=1)
+
+    assert not telemetry.enabled()
+    assert telemetry.counters() == {}
+    assert capsys.readouterr().out == ""
+
+
+@responses.activate
+def test_http_calls_are_logged_without_query(records: List[Dict[str, Any]]) -> None:
+    responses.add(responses.GET, "https://api.linkedin.com/rest/posts", status=404)
+
+    httpclient.session().get("https://api.linkedin.com/rest/posts?author=secret")
+
+    assert records[0]["severity"] == "WARNING"
+    assert records[0]["httpRequest"]["requestUrl"] == "https://api.linkedin.com/rest/posts"
+    assert records[0]["httpRequest"]["status"] == 404
+
+
+def test_http_calls_not_logged_when_disabled(disabled: None) -> None:
+    response = requests.Response()
+    httpclient._log_response(response)
+
+
+def test_slack_calls_are_logged(records: List[Dict[str, Any]]) -> None:
+    func = MagicMock(side_effect=SlackApiError("error", MagicMock(status_code=429)))
+
+    with pytest.raises(SlackApiError):
+        slackc._call("chat.postMessage", func, channel="C1", text="hi")
+
+    assert records[0]["httpRequest"]["requestUrl"] == "https://slack.com/api/chat.postMessage"
+    assert records[0]["httpRequest"]["status"] == 429
+
+
+def test_slack_calls_not_timed_when_disabled(disabled: None) -> None:
+    func = MagicMock(return_value={"ok": True})
+
+    assert slackc._call("chat.postMessage", func, channel="C1") == {"ok": True}
@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+import responses
+
+import cache
+import urns
+
+ACTIVITIES_URL = "https://api.linkedin.com/v2/activities"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache() -> Generator[cache.LRUCache, None, None]:
+    lru = cache.LRUCache()
+    with patch.object(urns, "_cache", lru):
+        with patch.dict(os.environ, {"LINKEDIN_TOKEN": "fake-token"}):
+            yield lru
+
+
+@responses.activate
+def test_resolve_batches_and_caches() -> None:
+    responses.add(
+        responses.GET,
+        ACTIVITIES_URL,
+        json={
+            "results": {
+                "urn:li:activity:1": {"domainEntity": "urn:li:share:10"},
+                "urn:li:activity:2": {"domainEntity": "urn:li:ugcPost:20"},
+            },
+            "errors": {"urn:li:activity:3": {"status": 404}},
+        },
+    )
+
+    activity_urns = ["urn:li:activity:1", "urn:li:activity:2", "urn:li:activity:3"]
+    expected = {"urn:li:activity:1": "urn:li:share:10", "urn:li:activity:2": "urn:li:ugcPost:20"}
+    assert urns.resolve(activity_urns) == expected
+    assert len(responses.calls) == 1
+    request_url = str(responses.calls[0].request.url)
+    assert "ids=List(urn%3Ali%3Aactivity%3A1,urn%3Ali%3Aactivity%3A2," in request_url
+
+    # Resolved at most once, including URNs without a mapping
+    assert urns.resolve(activity_urns) == expected
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_resolve_failure_falls_back_to_exact_urns() -> None:
+    responses.add(responses.GET, ACTIVITIES_URL, json={"message": "Unauthorized"}, status=401)
+
+    assert urns.resolve(["urn:li:activity:1"]) == {}
+
+    # Failures aren't cached, so the next run tries again
+    responses.replace(
+        responses.GET,
+        ACTIVITIES_URL,
+        json={"results": {"urn:li:activity:1": {"domainEntity": "urn:li:share:10"}}},
+    )
+    assert urns.resolve(["urn:li:activity:1"]) == {"urn:li:activity:1": "urn:li:share:10"}
+
+
+def test_equivalence_map_only_resolves_mixed_forms() -> None:
+    with patch.object(urns, "resolve", return_value={}) as mock_resolve:
+        assert urns.equivalence_map({"urn:li:activity:1"}, {"urn:li:activity:2"}) == {}
+        assert urns.equivalence_map({"urn:li:share:1"}, {"urn:li:ugcPost:2"}) == {}
+        mock_resolve.assert_not_called()
+
+        urns.equivalence_map({"urn:li:activity:1", "urn:li:share:5"}, {"urn:li:activity:2"})
+        # Only the other side's activity URNs can match the share URN
+        mock_resolve.assert_called_once_with(["urn:li:activity:2"])
+
+
+def test_with_equivalents() -> None:
+    mapping = {"urn:li:activity:1": "urn:li:share:10"}
+    assert urns.with_equivalents({"urn:li:activity:1", "urn:li:activity:2"}, mapping) == {
+        "urn:li:activity:1",
+        "urn:li:activity:2",
+        "urn:li:share:10",
+    }
+
+
+def test_resolver_cache_from_env(tmp_path: Path) -> None:
+    path = str(tmp_path / "urns.json")
+    with patch.object(urns, "_cache", None):
+        with patch.dict(os.environ, {"SOMESY_URN_CACHE_FILE": path}):
+            lru = urns.resolver_cache()
+            assert lru.path == path
+            assert urns.resolver_cache() is lru
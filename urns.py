@@ -0,0 +1,118 @@
+import os
+import threading
+import urllib.parse
+from typing import Dict, Iterable, List, Optional, Set
+
+import cache
+import httpclient
+import telemetry
+
+ACTIVITY_PREFIX = "urn:li:activity:"
+
+# Activity URNs resolved per batch request
+RESOLVE_BATCH_SIZE = 50
+
+# Resolved activity URNs kept in the cache, and for how long
+CACHE_MAX_SIZE = 10_000
+CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+_cache: Optional[cache.LRUCache] = None
+_cache_lock = threading.Lock()
+
+
+def is_activity(urn: str) -> bool:
+    return urn.startswith(ACTIVITY_PREFIX)
+
+
+def resolver_cache() -> cache.LRUCache:
+    """Return the activity -> share/ugcPost cache, persisted to SOMESY_URN_CACHE_FILE if set."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = cache.LRUCache(
+                    max_size=CACHE_MAX_SIZE,
+                    ttl_seconds=CACHE_TTL_SECONDS,
+                    path=os.getenv("SOMESY_URN_CACHE_FILE") or None,
+                )
+    return _cache
+
+
+def _fetch_domain_entities(activity_urns: List[str]) -> Dict[str, str]:
+    """Look up the share/ugcPost URN behind each activity URN with one batch request."""
+    # https://learn.microsoft.com/en-us/linkedin/marketing/community-management/shares/ugc-post-api#retrieve-activity-urn-to-share-or-ugc-post-urn-mapping
+    ids = ",".join(urllib.parse.quote(urn, safe="") for urn in activity_urns)
+    response = httpclient.session().get(
+        f"https://api.linkedin.com/v2/activities?ids=List({ids})",
+        headers={
+            "Authorization": f"Bearer {os.getenv('LINKEDIN_TOKEN')}",
+            "X-Restli-Protocol-Version": "2.0.0",
+        },
+    )
+    if response.status_code != 200:
+        raise Exception(
+            f"LinkedIn Activities API request failed with status {response.status_code}: {response.text}"
+        )
+    results: Dict[str, Dict[str, str]] = response.json().get("results", {})
+    return {
+        urn: result["domainEntity"] for urn, result in results.items() if "domainEntity" in result
+    }
+
+
+def resolve(activity_urns: Iterable[str]) -> Dict[str, str]:
+    """Map activity URNs to the share/ugcPost URNs of the same posts.
+
+    Each URN is looked up at most once per cache lifetime; URNs without a
+    mapping are cached too. Lookup failures are logged and leave the affected
+    URNs unresolved, so dedup falls back to exact URN matches.
+    """
+    resolved: Dict[str, str] = {}
+    missing: List[str] = []
+    for urn in dict.fromkeys(activity_urns):
+        domain_entity = resolver_cache().get(urn)
+        if domain_entity is None:
+            missing.append(urn)
+        elif domain_entity:
+            resolved[urn] = domain_entity
+
+    if not missing:
+        return resolved
+
+    with telemetry.span("resolve_urns", urns=len(missing)):
+        for i in range(0, len(missing), RESOLVE_BATCH_SIZE):
+            batch = missing[i : i + RESOLVE_BATCH_SIZE]
+            try:
+                fetched = _fetch_domain_entities(batch)
+            except Exception as e:
+                telemetry.log(
+                    f"Resolving LinkedIn URNs failed, matching exact URNs only: {e!r}",
+                    severity="WARNING",
+                )
+                break
+            for urn in batch:
+                # An empty string caches "no mapping", so the lookup isn't repeated
+                resolver_cache().put(urn, fetched.get(urn, ""))
+            resolved.update(fetched)
+
+    resolver_cache().save()
+    return resolved
+
+
+def equivalence_map(a: Set[str], b: Set[str]) -> Dict[str, str]:
+    """Resolve the activity URNs needed to compare two sets of URNs.
+
+    The same post can only appear under different URNs if one side has
+    activity URNs and the other share/ugcPost URNs, so only those activity
+    URNs are resolved; with matching forms no API call is made.
+    """
+    needed: List[str] = []
+    if any(not is_activity(urn) for urn in b):
+        needed.extend(urn for urn in a if is_activity(urn))
+    if any(not is_activity(urn) for urn in a):
+        needed.extend(urn for urn in b if is_activity(urn))
+    return resolve(needed) if needed else {}
+
+
+def with_equivalents(urns: Set[str], mapping: Dict[str, str]) -> Set[str]:
+    """The URNs plus the share/ugcPost URNs their activity URNs map to."""
+    return urns | {mapping[urn] for urn in urns if urn in mapping}